@@ -0,0 +1,149 @@
+import random
+from typing import List, Tuple
+
+import numpy as np
+
+from mastermind import COLORS
+
+CHUNK_SIZE = 1 << 20
+
+
+class Game:
+    """Mastermind with n_pegs pegs and any number of colors. A code is
+    encoded as the integer whose base-len(colors) digits, most significant
+    first, are the indices of its colors; a score (black, white) as the
+    integer black * (n_pegs + 1) + white.
+    Data attributes:
+    n_pegs   -- number of pegs of a code
+    colors   -- list of color names
+    n_colors -- number of colors
+    n_codes  -- number of possible codes
+    """
+
+    def __init__(self, n_pegs=4, colors=COLORS):
+        self.n_pegs = n_pegs
+        self.colors = list(colors)
+        self.n_colors = len(self.colors)
+        self.n_codes = self.n_colors**n_pegs
+        self._powers = self.n_colors ** np.arange(n_pegs - 1, -1, -1, dtype=np.int64)
+        # A code is split into its high and low halves, whose digits are
+        # tabulated once so that scoring never divides a code peg by peg.
+        self._n_low = n_pegs // 2
+        self._low_size = self.n_colors**self._n_low
+        self._high_digits = self.digits(np.arange(self.n_colors ** (n_pegs - self._n_low)))[self._n_low :]
+        self._low_digits = self.digits(np.arange(self._low_size))[n_pegs - self._n_low :]
+
+    def __repr__(self):
+        return f"Game(n_pegs={self.n_pegs}, colors={self.colors})"
+
+    def encode(self, code) -> int:
+        """Return the integer encoding code, a list of color names."""
+        index = 0
+        for color in code:
+            index = index * self.n_colors + self.colors.index(color)
+        return index
+
+    def decode(self, index) -> List[str]:
+        """Return the list of color names encoded by index."""
+        return [self.colors[digit] for digit in self.digits(np.array([index]))[:, 0]]
+
+    def create_code(self) -> int:
+        """Return a random code."""
+        return random.randrange(self.n_codes)
+
+    def encode_score(self, black, white) -> int:
+        """Return the integer encoding the score (black, white)."""
+        return black * (self.n_pegs + 1) + white
+
+    def decode_score(self, score) -> Tuple[int, int]:
+        """Return the (black, white) score encoded by score."""
+        return divmod(int(score), self.n_pegs + 1)
+
+    def digits(self, codes) -> np.ndarray:
+        """Return the (n_pegs, len(codes)) array of the color indices of
+        the given array of codes.
+        """
+        codes = np.asarray(codes, dtype=np.int64)
+        return (codes[None, :] // self._powers[:, None] % self.n_colors).astype(np.uint8)
+
+    def _half_tables(self, guess):
+        """Return the per-half lookup tables of guess: the black pins of
+        each high and each low half, and for each color of the guess, its
+        count in the guess and in each high and each low half.
+        """
+        guess_digits = self.digits(np.array([guess]))[:, 0]
+        n_high = self.n_pegs - self._n_low
+        black = (
+            (self._high_digits == guess_digits[:n_high, None]).sum(axis=0, dtype=np.uint8),
+            (self._low_digits == guess_digits[n_high:, None]).sum(axis=0, dtype=np.uint8),
+        )
+        # Colors absent from the guess cannot give pins.
+        colors = [
+            (
+                np.uint8(guess_count),
+                (self._high_digits == color).sum(axis=0, dtype=np.uint8),
+                (self._low_digits == color).sum(axis=0, dtype=np.uint8),
+            )
+            for color, guess_count in zip(*np.unique(guess_digits, return_counts=True))
+        ]
+        return black, colors
+
+    def _score_halves(self, tables, high, low) -> np.ndarray:
+        """Return the encoded scores of the codes with the given (broadcast)
+        arrays of high and low halves, using the tables of _half_tables.
+        """
+        (black_high, black_low), colors = tables
+        black = black_high[high] + black_low[low]
+        pins = np.zeros_like(black)
+        for guess_count, count_high, count_low in colors:
+            pins += np.minimum(count_high[high] + count_low[low], guess_count)
+        return black * np.uint8(self.n_pegs + 1) + (pins - black)
+
+    def score(self, guess, codes) -> np.ndarray:
+        """Return the encoded scores of guess against each of the given
+        array of codes, with the semantics of score_guess.
+        """
+        high, low = np.divmod(np.asarray(codes, dtype=np.int64), self._low_size)
+        return self._score_halves(self._half_tables(guess), high, low)
+
+    def score_guess(self, guess, code) -> Tuple[int, int]:
+        """Return (black, white) for the encoded codes guess and code."""
+        return self.decode_score(self.score(guess, np.array([code]))[0])
+
+    def prune(self, candidates, guess, score) -> np.ndarray:
+        """Return the codes among candidates for which guess scores score.
+        candidates is an array of codes, or None for all codes, which are
+        then scored about CHUNK_SIZE at a time as blocks of high halves
+        times all low halves.
+        """
+        if candidates is not None:
+            candidates = np.asarray(candidates, dtype=np.int64)
+            return candidates[self.score(guess, candidates) == score]
+        tables = self._half_tables(guess)
+        low = np.arange(self._low_size)
+        n_high = self.n_codes // self._low_size
+        block = max(1, CHUNK_SIZE // self._low_size)
+        kept = []
+        for start in range(0, n_high, block):
+            high = np.arange(start, min(start + block, n_high))
+            rows, columns = np.nonzero(self._score_halves(tables, high[:, None], low[None, :]) == score)
+            kept.append(high[rows] * self._low_size + columns)
+        return np.concatenate(kept)
+
+    def play(self, secret, first_guess=None) -> List[int]:
+        """Return the guesses made to find secret by always guessing the
+        first code consistent with the previous scores. The default first
+        guess pairs up the colors: for 4 pegs, [color 0, color 0, color 1, color 1].
+        """
+        if first_guess is None:
+            first_guess = self.encode([self.colors[(i // 2) % self.n_colors] for i in range(self.n_pegs)])
+        candidates = None
+        guess = first_guess
+        guesses = []
+        while True:
+            guesses.append(guess)
+            score = self.score_guess(guess, secret)
+            if score == (self.n_pegs, 0):
+                return guesses
+            candidates = self.prune(candidates, guess, self.encode_score(*score))
+            guess = int(candidates[0])
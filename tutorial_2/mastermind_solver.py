@@ -0,0 +1,136 @@
+import itertools
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from mastermind import COLORS
+
+N_PEGS = 4
+CODES = [list(code) for code in itertools.product(COLORS, repeat=N_PEGS)]
+N_SCORES = (N_PEGS + 1) ** 2
+STRATEGIES = ("minimax", "expected")
+
+
+def encode_score(black, white) -> int:
+    """Return the small integer encoding the score (black, white)."""
+    return black * (N_PEGS + 1) + white
+
+
+def decode_score(score) -> Tuple[int, int]:
+    """Return the (black, white) score encoded by the integer score."""
+    return divmod(int(score), N_PEGS + 1)
+
+
+WINNING_SCORE = encode_score(N_PEGS, 0)
+
+
+def code_index(code) -> int:
+    """Return the index of code (a list of colors) in CODES."""
+    index = 0
+    for color in code:
+        index = index * len(COLORS) + COLORS.index(color)
+    return index
+
+
+@lru_cache(maxsize=None)
+def score_table() -> np.ndarray:
+    """Return the uint8 array whose entry [g, c] is the encoded
+    score_guess(CODES[g], CODES[c]), computed for all pairs at once.
+    """
+    pegs = np.array([[COLORS.index(color) for color in code] for code in CODES], dtype=np.uint8)
+    black = (pegs[:, None, :] == pegs[None, :, :]).sum(axis=2, dtype=np.uint8)
+    counts = np.stack([(pegs == color).sum(axis=1, dtype=np.uint8) for color in range(len(COLORS))], axis=1)
+    pins = np.minimum(counts[:, None, :], counts[None, :, :]).sum(axis=2, dtype=np.uint8)
+    table = encode_score(black, pins - black).astype(np.uint8)
+    table.setflags(write=False)
+    return table
+
+
+class Solver:
+    """Knuth's Mastermind solver over the precomputed score table.
+    Each guess minimizes, over all codes, either the size of the largest
+    set of candidates left ('minimax', at most 5 guesses) or the expected
+    number of candidates left ('expected'). Ties are broken in favor of
+    candidates, then of the first code in CODES. As the strategy is
+    deterministic, the guess for each sequence of scores is only computed
+    once.
+    """
+
+    def __init__(self, strategy="minimax"):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown strategy: {strategy}")
+        self.strategy = strategy
+        self.table = score_table()
+        self._guesses: Dict[Tuple[int, ...], int] = {}
+
+    def candidates(self, scores) -> np.ndarray:
+        """Return the indices of the codes consistent with the given
+        sequence of scores of the solver's guesses.
+        """
+        consistent = np.ones(len(CODES), dtype=bool)
+        for i, score in enumerate(scores):
+            consistent &= self.table[self.next_guess(scores[:i])] == score
+        return np.flatnonzero(consistent)
+
+    def next_guess(self, scores=()) -> int:
+        """Return the index of the code to guess after the given sequence
+        of scores of the solver's previous guesses.
+        """
+        scores = tuple(scores)
+        if scores in self._guesses:
+            return self._guesses[scores]
+        if not scores:
+            guess = code_index([COLORS[0], COLORS[0], COLORS[1], COLORS[1]])
+        else:
+            candidates = self.candidates(scores)
+            if len(candidates) == 0:
+                raise ValueError("No code is consistent with the scores")
+            if len(candidates) == 1:
+                guess = int(candidates[0])
+            else:
+                guess = self._best_guess(candidates)
+        self._guesses[scores] = guess
+        return guess
+
+    def _best_guess(self, candidates) -> int:
+        """Return the guess splitting candidates best for the strategy."""
+        n_codes = len(CODES)
+        scores = self.table[:, candidates].astype(np.intp)
+        scores += np.arange(n_codes)[:, None] * N_SCORES
+        partitions = np.bincount(scores.ravel(), minlength=n_codes * N_SCORES).reshape(n_codes, N_SCORES)
+        if self.strategy == "minimax":
+            cost = partitions.max(axis=1)
+        else:
+            cost = (partitions * partitions).sum(axis=1)
+        is_candidate = np.zeros(n_codes, dtype=bool)
+        is_candidate[candidates] = True
+        best = np.flatnonzero(cost == cost.min())
+        preferred = best[is_candidate[best]]
+        return int(preferred[0] if len(preferred) else best[0])
+
+    def play(self, code) -> List[List[str]]:
+        """Return the guesses the solver makes to find code, the last
+        one being code itself.
+        """
+        secret = code_index(code)
+        scores: Tuple[int, ...] = ()
+        guesses = []
+        while True:
+            guess = self.next_guess(scores)
+            guesses.append(CODES[guess])
+            score = int(self.table[guess, secret])
+            if score == WINNING_SCORE:
+                return guesses
+            scores += (score,)
+
+
+def solve(code, strategy="minimax") -> List[List[str]]:
+    """Return the guesses Knuth's solver makes to find code."""
+    return Solver(strategy).play(code)
+
+
+def solve_all(strategy="minimax") -> np.ndarray:
+    """Return the number of guesses the solver needs for each code of CODES."""
+    solver = Solver(strategy)
+    return np.array([len(solver.play(code)) for code in CODES])
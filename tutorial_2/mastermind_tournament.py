@@ -0,0 +1,168 @@
+import json
+import os
+import random
+import time
+from abc import ABC, abstractmethod
+from multiprocessing import Pool
+from typing import Dict, List, Tuple
+
+from mastermind import score_guess
+from mastermind_solver import CODES, Solver, encode_score
+
+MAX_ROUNDS = 20
+
+
+class Strategy(ABC):
+    """A headless Mastermind player. next_guess is given the history of
+    the current game, a list of (guess, (black, white)) pairs, and returns
+    the next guess as a list of colors. Strategies must be picklable, and
+    their name identifies their results in the tournament cache.
+    """
+
+    name = "strategy"
+
+    @abstractmethod
+    def next_guess(self, history) -> List[str]:
+        """Return the next guess given the history of the current game."""
+
+
+class FirstConsistent(Strategy):
+    """Guess the first code, in CODES order, consistent with the history."""
+
+    name = "first-consistent"
+
+    def next_guess(self, history) -> List[str]:
+        for code in CODES:
+            if all(score_guess(guess, code) == score for guess, score in history):
+                return code
+        raise ValueError("No code is consistent with the history")
+
+
+class RandomConsistent(Strategy):
+    """Guess a random code consistent with the history."""
+
+    def __init__(self, seed=0):
+        self.seed = seed
+        self.name = f"random-consistent-{seed}"
+
+    def next_guess(self, history) -> List[str]:
+        # Seeding with the history makes each game reproducible.
+        rng = random.Random(repr((self.seed, history)))
+        candidates = [code for code in CODES if all(score_guess(guess, code) == score for guess, score in history)]
+        return rng.choice(candidates)
+
+
+class Knuth(Strategy):
+    """Play Knuth's solver from mastermind_solver."""
+
+    def __init__(self, strategy="minimax"):
+        self.strategy = strategy
+        self.name = f"knuth-{strategy}"
+        self._solver = None
+
+    def __getstate__(self):
+        return {"strategy": self.strategy, "name": self.name, "_solver": None}
+
+    def next_guess(self, history) -> List[str]:
+        if self._solver is None:
+            self._solver = Solver(self.strategy)
+        scores = tuple(encode_score(*score) for _, score in history)
+        return CODES[self._solver.next_guess(scores)]
+
+
+def play_game(strategy, code, max_rounds=MAX_ROUNDS) -> int:
+    """Return the number of guesses strategy needs to find code, or
+    max_rounds + 1 if it does not find it within max_rounds guesses.
+    """
+    history: List[Tuple[List[str], Tuple[int, int]]] = []
+    for n_round in range(1, max_rounds + 1):
+        guess = strategy.next_guess(history)
+        score = score_guess(guess, code)
+        if score == (len(code), 0):
+            return n_round
+        history.append((guess, score))
+    return max_rounds + 1
+
+
+def _play_games(strategy, codes) -> Tuple[List[int], float]:
+    """Pool task: return the number of guesses for each code and the time taken."""
+    start = time.perf_counter()
+    n_guesses = [play_game(strategy, code) for code in codes]
+    return n_guesses, time.perf_counter() - start
+
+
+def _cache_key(strategy, code) -> str:
+    return strategy.name + "|" + ",".join(code)
+
+
+def load_cache(cache_file) -> Dict[str, int]:
+    """Return the cached number of guesses per (strategy, code) key."""
+    if cache_file is None or not os.path.exists(cache_file):
+        return {}
+    with open(cache_file) as f:
+        return json.load(f)
+
+
+def save_cache(cache, cache_file) -> None:
+    """Atomically write the cache to cache_file."""
+    temporary_file = cache_file + ".tmp"
+    with open(temporary_file, "w") as f:
+        json.dump(cache, f)
+    os.replace(temporary_file, cache_file)
+
+
+def run_tournament(strategies, codes=None, sample=None, seed=0, n_workers=None, chunk_size=64, cache_file=None):
+    """Play every strategy against every code of codes (by default all
+    codes, or sample of them drawn with seed) on a process pool, and
+    return a report per strategy name: number of games, average and worst
+    number of guesses, and guesses per second of computation (None if all
+    games were cached). Results are kept per (strategy, code) in the JSON
+    file cache_file, if given, so that reruns only play the new games.
+    """
+    if codes is None:
+        codes = CODES
+    if sample is not None:
+        codes = random.Random(seed).sample(list(codes), sample)
+    cache = load_cache(cache_file)
+
+    tasks = []
+    for strategy in strategies:
+        missing = [code for code in codes if _cache_key(strategy, code) not in cache]
+        for start in range(0, len(missing), chunk_size):
+            tasks.append((strategy, missing[start : start + chunk_size]))
+
+    played = {strategy.name: [0, 0.0] for strategy in strategies}
+    if tasks:
+        with Pool(n_workers) as pool:
+            for (strategy, chunk), (n_guesses, elapsed) in zip(tasks, pool.starmap(_play_games, tasks)):
+                for code, n in zip(chunk, n_guesses):
+                    cache[_cache_key(strategy, code)] = n
+                played[strategy.name][0] += sum(n_guesses)
+                played[strategy.name][1] += elapsed
+        if cache_file is not None:
+            save_cache(cache, cache_file)
+
+    report = {}
+    for strategy in strategies:
+        n_guesses = [cache[_cache_key(strategy, code)] for code in codes]
+        guesses, elapsed = played[strategy.name]
+        report[strategy.name] = {
+            "games": len(n_guesses),
+            "average": sum(n_guesses) / len(n_guesses) if n_guesses else None,
+            "worst": max(n_guesses, default=None),
+            "guesses_per_second": guesses / elapsed if elapsed else None,
+        }
+    return report
+
+
+def print_report(report) -> None:
+    """Pretty print a report returned by run_tournament."""
+    print(f"{'strategy':<24}{'games':>8}{'average':>10}{'worst':>8}{'guesses/s':>12}")
+    for name, result in report.items():
+        speed = result["guesses_per_second"]
+        speed = f"{speed:12.0f}" if speed is not None else f"{'cached':>12}"
+        print(f"{name:<24}{result['games']:>8}{result['average']:>10.3f}{result['worst']:>8}{speed}")
+
+
+if __name__ == "__main__":
+    print_report(run_tournament([FirstConsistent(), RandomConsistent(), Knuth("minimax"), Knuth("expected")]))
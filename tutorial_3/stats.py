@@ -1,3 +1,6 @@
+CHUNK_LINES = 10000
+
+
 def average(numlist):
     """Return average of list of numbers"""
     return (sum(numlist) / len(numlist)).__round__(2)
@@ -74,14 +77,81 @@ def summary_per_tutorial(infilename, outfilename):
                 for j, result in enumerate(results):
                     tds_data[j].append(result)
         for i, td_data in enumerate(tds_data):
-            file.write(
-                "TD"
-                + str(i + 1)
-                + ": average: "
-                + str(average(td_data).__round__(2))
-                + " min: "
-                + str(min(td_data))
-                + " max: "
-                + str(max(td_data))
-                + "\n"
-            )
+            file.write(tutorial_to_string(i, average(td_data), min(td_data), max(td_data)))
+
+
+def tutorial_to_string(i, td_average, td_min, td_max):
+    """Return the summary line of the i-th (from 0) tutorial."""
+    return (
+        "TD"
+        + str(i + 1)
+        + ": average: "
+        + str(td_average.__round__(2))
+        + " min: "
+        + str(td_min)
+        + " max: "
+        + str(td_max)
+        + "\n"
+    )
+
+
+class TutorialTotals:
+    """Running per-tutorial statistics, updated one student at a time.
+    Data attributes:
+    count -- number of students added
+    sums  -- list of the sums of the scores of each tutorial
+    mins  -- list of the minimum score of each tutorial
+    maxs  -- list of the maximum score of each tutorial
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.sums = []
+        self.mins = []
+        self.maxs = []
+
+    def add(self, results):
+        """Add the results of one student."""
+        if self.count == 0:
+            self.sums = [0 + result for result in results]
+            self.mins = list(results)
+            self.maxs = list(results)
+        else:
+            for j, result in enumerate(results):
+                self.sums[j] += result
+                if result < self.mins[j]:
+                    self.mins[j] = result
+                if result > self.maxs[j]:
+                    self.maxs[j] = result
+        self.count += 1
+
+    def lines(self):
+        """Generate the lines written by summary_per_tutorial."""
+        for i, (td_sum, td_min, td_max) in enumerate(zip(self.sums, self.mins, self.maxs)):
+            yield tutorial_to_string(i, (td_sum / self.count).__round__(2), td_min, td_max)
+
+
+def summaries_streaming(infilename, student_outfilename, tutorial_outfilename, chunk_lines=CHUNK_LINES):
+    """Write the outputs of summary_per_student and summary_per_tutorial
+    in a single pass over the input file, in constant memory: students are
+    summarized as they are read, with running totals for the tutorials, and
+    the student lines are written chunk_lines at a time.
+    """
+    totals = TutorialTotals()
+    summed_total = 0
+    with open(infilename) as infile, open(student_outfilename, "w") as student_file:
+        buffer = []
+        for line in infile:
+            name, results = student_data(line)
+            totals.add(results)
+            results = discard_scores(results)
+            summed = sum(results)
+            summed_total += summed
+            buffer.append(tuple_to_string(name, results) + " sum: " + str(summed.__round__(2)) + "\n")
+            if len(buffer) >= chunk_lines:
+                student_file.writelines(buffer)
+                buffer.clear()
+        buffer.append("total average: " + str((summed_total / totals.count).__round__(2)) + "\n")
+        student_file.writelines(buffer)
+    with open(tutorial_outfilename, "w") as tutorial_file:
+        tutorial_file.writelines(totals.lines())
@@ -0,0 +1,190 @@
+import hashlib
+import json
+import os
+import shutil
+from copy import deepcopy
+
+from stats import CHUNK_LINES, TutorialTotals, discard_scores, student_data, tuple_to_string
+
+DIGEST_BYTES = 1 << 20
+
+
+class SummaryCache:
+    """On-disk cache of the per-student lines and per-tutorial running
+    statistics of a student data file. When lines have been appended to
+    the file since the last update, only the new lines are parsed; both
+    summaries are then written from the cache without rereading the input.
+    The cache is kept if the file is unchanged (same size and mtime), or
+    if it grew and the last cached DIGEST_BYTES chunk, the one the new
+    lines follow, still matches its stored digest; otherwise the cache is
+    rebuilt. With verify, every cached chunk is checked instead, which
+    rereads the whole cached part of the file but also detects edits
+    before the last chunk of a file that grew.
+    Data attributes:
+    filename  -- the student data file
+    cache_dir -- directory holding state.json and students.txt
+    verify    -- whether updates check every cached chunk
+    state     -- dictionary of the cached statistics, see _empty_state
+    """
+
+    def __init__(self, filename, cache_dir=None, verify=False):
+        self.filename = os.path.abspath(filename)
+        self.cache_dir = cache_dir or self.filename + ".cache"
+        self.verify = verify
+        self.state = self._load_state()
+
+    @property
+    def _state_file(self):
+        return os.path.join(self.cache_dir, "state.json")
+
+    @property
+    def _students_file(self):
+        return os.path.join(self.cache_dir, "students.txt")
+
+    def _empty_state(self):
+        return {
+            "path": self.filename,
+            "offset": 0,
+            "size": -1,
+            "mtime": None,
+            "digests": [],
+            "students_size": 0,
+            "count": 0,
+            "summed_total": 0,
+            "sums": [],
+            "mins": [],
+            "maxs": [],
+        }
+
+    def _load_state(self):
+        """Return the saved state, or an empty one if there is none."""
+        try:
+            with open(self._state_file) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return self._empty_state()
+        if state.get("path") != self.filename or state.keys() != self._empty_state().keys():
+            return self._empty_state()
+        return state
+
+    def _save_state(self):
+        """Atomically replace the saved state."""
+        temporary_file = self._state_file + ".tmp"
+        with open(temporary_file, "w") as f:
+            json.dump(self.state, f)
+        os.replace(temporary_file, self._state_file)
+
+    def _digests(self, f, start, end):
+        """Return the hashes of the DIGEST_BYTES chunks of f from start, a
+        multiple of DIGEST_BYTES, to end; the last chunk may be shorter.
+        """
+        f.seek(start)
+        digests = []
+        for position in range(start, end, DIGEST_BYTES):
+            digests.append(hashlib.sha256(f.read(min(DIGEST_BYTES, end - position))).hexdigest())
+        return digests
+
+    def update(self):
+        """Bring the cache up to date with the file, parsing only the
+        lines appended since the last update when possible. Return the
+        trailing line of the file if it does not end with a newline; it
+        is not cached, as it may still be growing.
+        """
+        stat = os.stat(self.filename)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tail = None
+        with open(self.filename, "rb") as f:
+            state = self.state
+            unchanged = stat.st_size == state["size"] and stat.st_mtime == state["mtime"]
+            # The chunks from the last one before the cached offset to be checked.
+            kept = 0 if self.verify or not state["digests"] else len(state["digests"]) - 1
+            appended = (
+                not unchanged
+                and stat.st_size > state["size"]
+                and self._digests(f, kept * DIGEST_BYTES, state["offset"]) == state["digests"][kept:]
+            )
+            if not unchanged and not appended:
+                self.state = state = self._empty_state()
+            totals = self._totals()
+            f.seek(state["offset"])
+            with open(self._students_file, "a") as students:
+                students.truncate(state["students_size"])
+                buffer = []
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        tail = line.decode()
+                        break
+                    student_line, summed = _summarize(line.decode(), totals)
+                    buffer.append(student_line)
+                    state["summed_total"] += summed
+                    state["offset"] += len(line)
+                    if len(buffer) >= CHUNK_LINES:
+                        students.writelines(buffer)
+                        buffer.clear()
+                students.writelines(buffer)
+            state["count"], state["sums"], state["mins"], state["maxs"] = (
+                totals.count,
+                totals.sums,
+                totals.mins,
+                totals.maxs,
+            )
+            state["students_size"] = os.path.getsize(self._students_file)
+            # Only the chunks from the last one before the old offset change.
+            kept = len(state["digests"]) - 1 if state["digests"] else 0
+            start = kept * DIGEST_BYTES
+            state["digests"] = state["digests"][:kept] + self._digests(f, start, state["offset"])
+        state["size"] = stat.st_size
+        state["mtime"] = stat.st_mtime
+        self._save_state()
+        return tail
+
+    def _totals(self):
+        """Return a TutorialTotals holding the cached statistics."""
+        totals = TutorialTotals()
+        totals.count = self.state["count"]
+        totals.sums, totals.mins, totals.maxs = self.state["sums"], self.state["mins"], self.state["maxs"]
+        return totals
+
+    def summary_per_student(self, outfilename):
+        """Update the cache and write the output of summary_per_student."""
+        tail = self.update()
+        count, summed_total = self.state["count"], self.state["summed_total"]
+        with open(outfilename, "w") as f:
+            with open(self._students_file) as students:
+                shutil.copyfileobj(students, f)
+            if tail is not None:
+                student_line, summed = _summarize(tail, deepcopy(self._totals()))
+                f.write(student_line)
+                count, summed_total = count + 1, summed_total + summed
+            f.write("total average: " + str((summed_total / count).__round__(2)) + "\n")
+
+    def summary_per_tutorial(self, outfilename):
+        """Update the cache and write the output of summary_per_tutorial."""
+        tail = self.update()
+        totals = self._totals()
+        if tail is not None:
+            totals = deepcopy(totals)
+            totals.add(student_data(tail)[1])
+        with open(outfilename, "w") as f:
+            f.writelines(totals.lines())
+
+
+def _summarize(line, totals):
+    """Add the student of line to totals, and return its summary line and
+    the sum of its kept scores.
+    """
+    name, results = student_data(line)
+    totals.add(results)
+    results = discard_scores(results)
+    summed = sum(results)
+    return tuple_to_string(name, results) + " sum: " + str(summed.__round__(2)) + "\n", summed
+
+
+def summary_per_student_cached(infilename, outfilename, cache_dir=None):
+    """Like summary_per_student, reusing the cache of infilename."""
+    SummaryCache(infilename, cache_dir).summary_per_student(outfilename)
+
+
+def summary_per_tutorial_cached(infilename, outfilename, cache_dir=None):
+    """Like summary_per_tutorial, reusing the cache of infilename."""
+    SummaryCache(infilename, cache_dir).summary_per_tutorial(outfilename)
@@ -0,0 +1,198 @@
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from stats import tuple_to_string, tutorial_to_string
+
+
+class Scores:
+    """Student scores stored column by column.
+    Data attributes:
+    names  -- list of login names, in file order
+    index  -- dictionary mapping each login name to its row
+    values -- float array of shape (number of students, number of TDs)
+    """
+
+    def __init__(self, names, values):
+        self.names = names
+        self.index = {name: row for row, name in enumerate(names)}
+        self.values = values
+
+    def __len__(self):
+        return len(self.names)
+
+    def __repr__(self):
+        return f"Scores({len(self.names)} students, {self.values.shape[1]} TDs)"
+
+
+def parse_lines(lines) -> Scores:
+    """Parse an iterable of student data lines into a Scores object.
+    Raise ValueError on the first line whose number of scores differs from
+    the first line's.
+    """
+    names = []
+    rows = []
+    n_values = None
+    for line in lines:
+        name, string_floats = line.split(" ", 1)
+        n_row_values = len(string_floats.split())
+        if n_values is None:
+            n_values = n_row_values
+        elif n_row_values != n_values:
+            raise ValueError(f"Every student must have {n_values} scores, {name} has {n_row_values}")
+        names.append(name)
+        rows.append(string_floats)
+    n_values = n_values or 0
+    values = np.fromstring(" ".join(rows), dtype=np.float64, sep=" ")
+    if values.size != len(names) * n_values:
+        raise ValueError("Every score must be a number")
+    return Scores(names, values.reshape(len(names), n_values))
+
+
+def read_columnar(filename) -> Scores:
+    """Read the student data file into a Scores object in one pass."""
+    with open(filename) as f:
+        return parse_lines(f)
+
+
+def row_sums(values) -> np.ndarray:
+    """Return the sum of each row, adding the columns from left to right
+    like the built-in sum does.
+    """
+    # Like sum([]), a row without values sums to the integer 0.
+    total = np.zeros(values.shape[0], dtype=np.float64 if values.shape[1] else np.int64)
+    for column in values.T:
+        total += column
+    return total
+
+
+def extract_averages(filename) -> List[Tuple[str, float]]:
+    """Return list of name and average for each line in file"""
+    scores = read_columnar(filename)
+    averages = row_sums(scores.values) / scores.values.shape[1]
+    return [(name, round(average, 2)) for name, average in zip(scores.names, averages.tolist())]
+
+
+def lowest_two(values) -> np.ndarray:
+    """Return the (number of students, 2) array of the columns of the two
+    lowest scores of each row after the first two columns, in the order
+    discard_scores removes them (the first lowest one in case of ties,
+    like list.remove).
+    """
+    masked = values[:, 2:].copy()
+    rows = np.arange(values.shape[0])
+    lowest = np.empty((values.shape[0], 2), dtype=np.intp)
+    for i in range(2):
+        lowest[:, i] = np.argmin(masked, axis=1)
+        masked[rows, lowest[:, i]] = np.inf
+    return lowest + 2
+
+
+def discard_scores(values, lowest=None) -> np.ndarray:
+    """Return the array of scores with, in every row, the first two, and
+    then the lowest two, scores discarded. lowest may give the result of
+    lowest_two(values) if it is already known.
+    """
+    if lowest is None:
+        lowest = lowest_two(values)
+    keep = np.ones(values.shape, dtype=bool)
+    keep[:, :2] = False
+    rows = np.arange(values.shape[0])
+    keep[rows, lowest[:, 0]] = False
+    keep[rows, lowest[:, 1]] = False
+    return values[keep].reshape(values.shape[0], values.shape[1] - 4)
+
+
+class ScoreIndex:
+    """Query layer over Scores, built once: every TD column is sorted, so
+    that percentiles are O(1), top-k queries O(k) and histograms O(log n)
+    per bin, and the two lowest scores dropped by discard_scores are
+    located for every student. TDs are numbered from 1, like in the
+    summaries.
+    Data attributes:
+    scores -- the indexed Scores
+    order  -- order[:, td - 1] lists the rows by increasing score in that TD
+    sorted -- sorted[:, td - 1] lists the scores of that TD in increasing order
+    lowest -- lowest[row] gives the columns of the two scores discard_scores drops
+    """
+
+    def __init__(self, scores):
+        self.scores = scores
+        self.order = np.argsort(scores.values, axis=0, kind="stable")
+        self.sorted = np.take_along_axis(scores.values, self.order, axis=0)
+        self.lowest = lowest_two(scores.values)
+
+    def percentile(self, td, q) -> float:
+        """Return the q-th percentile (0 <= q <= 100) of the scores of td,
+        interpolating linearly between ranks like numpy.percentile.
+        """
+        column = self.sorted[:, td - 1]
+        position = q / 100 * (len(column) - 1)
+        below = int(position)
+        above = min(below + 1, len(column) - 1)
+        return float(column[below] + (column[above] - column[below]) * (position - below))
+
+    def median(self, td) -> float:
+        """Return the median score of td."""
+        return self.percentile(td, 50)
+
+    def top(self, td, k) -> List[Tuple[str, float]]:
+        """Return the (name, score) of the k best students of td, best first."""
+        rows = self.order[::-1, td - 1][:k].tolist()
+        return [(self.scores.names[row], float(self.scores.values[row, td - 1])) for row in rows]
+
+    def count_between(self, td, low, high) -> int:
+        """Return the number of scores of td in [low, high)."""
+        column = self.sorted[:, td - 1]
+        return int(np.searchsorted(column, high, side="left") - np.searchsorted(column, low, side="left"))
+
+    def histogram(self, td, edges) -> List[int]:
+        """Return the number of scores of td in each bin [edges[i],
+        edges[i + 1]), the last bin also holding scores equal to edges[-1].
+        """
+        column = self.sorted[:, td - 1]
+        counts = np.diff(np.searchsorted(column, edges, side="left"))
+        counts[-1] += np.searchsorted(column, edges[-1], side="right") - np.searchsorted(column, edges[-1], side="left")
+        return counts.tolist()
+
+    def discard_scores(self, name) -> List[float]:
+        """Return the scores of the student with the first two, and then
+        the lowest two, scores discarded, as stats.discard_scores does.
+        """
+        row = self.scores.index[name]
+        dropped = {0, 1, *self.lowest[row].tolist()}
+        return [score for column, score in enumerate(self.scores.values[row].tolist()) if column not in dropped]
+
+
+def summary_per_student(infilename, outfilename):
+    """Create summaries per student from the input file
+    and write the summaries to the output file.
+    """
+    scores = read_columnar(infilename)
+    results = discard_scores(scores.values)
+    sums = row_sums(results)
+    with open(outfilename, "w") as f:
+        for name, kept, total in zip(scores.names, results.tolist(), sums.tolist()):
+            f.write(tuple_to_string(name, kept) + " sum: " + str(round(total, 2)) + "\n")
+        f.write("total average: " + str(round(sum(sums.tolist()) / len(sums), 2)) + "\n")
+
+
+def tutorial_summaries(values) -> List[Dict[str, float]]:
+    """Return the average, min and max of each TD (column) of values."""
+    averages = values.sum(axis=0) / values.shape[0]
+    minima = values.min(axis=0)
+    maxima = values.max(axis=0)
+    return [
+        {"average": round(average, 2), "min": low, "max": high}
+        for average, low, high in zip(averages.tolist(), minima.tolist(), maxima.tolist())
+    ]
+
+
+def summary_per_tutorial(infilename, outfilename):
+    """Create summaries per tutorial from infile and write to outfile:
+    one line per TD with its average, minimum, and maximum scores.
+    """
+    scores = read_columnar(infilename)
+    with open(outfilename, "w") as file:
+        for i, summary in enumerate(tutorial_summaries(scores.values)):
+            file.write(tutorial_to_string(i, summary["average"], summary["min"], summary["max"]))
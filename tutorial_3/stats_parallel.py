@@ -0,0 +1,84 @@
+import os
+from functools import partial
+from multiprocessing import Pool
+from typing import List, Tuple
+
+import numpy as np
+
+from stats import TutorialTotals
+from stats_columnar import parse_lines
+
+
+def byte_ranges(filename, n_ranges) -> List[Tuple[int, int]]:
+    """Split the file into n_ranges (start, end) byte ranges of about the
+    same size. Ranges do not need to fall on line boundaries: read_range
+    assigns each line to the range it starts in.
+    """
+    size = os.path.getsize(filename)
+    bounds = [size * i // n_ranges for i in range(n_ranges + 1)]
+    return [(start, end) for start, end in zip(bounds[:-1], bounds[1:]) if start < end]
+
+
+def read_range(filename, start, end) -> List[str]:
+    """Return the lines of the file starting in the byte range [start, end)."""
+    with open(filename, "rb") as f:
+        if start > 0:
+            f.seek(start - 1)
+            f.readline()
+        position = f.tell()
+        if position >= end:
+            return []
+        data = f.read(end - position)
+        if not data.endswith(b"\n"):
+            data += f.readline()
+    return data.decode().splitlines()
+
+
+def partial_totals(filename, byte_range):
+    """Pool task: parse the lines starting in the (start, end) byte_range
+    and return their count, per-TD minima and maxima, and the parsed
+    scores, whose sums are folded in file order by the caller.
+    """
+    values = parse_lines(read_range(filename, *byte_range)).values
+    if len(values) == 0:
+        return 0, None, None, values
+    return len(values), values.min(axis=0), values.max(axis=0), values
+
+
+def tutorial_totals_parallel(filename, n_workers=None, n_ranges=None) -> TutorialTotals:
+    """Compute the per-tutorial statistics of the file, parsing byte
+    ranges of it in a process pool and folding each partial result into
+    the totals as it arrives, in file order.
+    """
+    n_workers = n_workers or os.cpu_count() or 1
+    ranges = byte_ranges(filename, n_ranges or 4 * n_workers)
+    totals = TutorialTotals()
+    sums = mins = maxs = None
+    with Pool(n_workers) as pool:
+        for count, range_mins, range_maxs, values in pool.imap(partial(partial_totals, filename), ranges):
+            if count == 0:
+                continue
+            if sums is None:
+                # Like sum(), start from the integer 0 and add in file order.
+                sums = np.zeros(values.shape[1])
+                mins, maxs = range_mins, range_maxs
+            else:
+                mins = np.where(range_mins < mins, range_mins, mins)
+                maxs = np.where(range_maxs > maxs, range_maxs, maxs)
+            # Adding the running sums into the first row keeps the order of
+            # the additions without copying the scores.
+            values[0] = sums + values[0]
+            sums = np.add.reduce(values, axis=0)
+            totals.count += count
+    if sums is not None:
+        totals.sums, totals.mins, totals.maxs = sums.tolist(), mins.tolist(), maxs.tolist()
+    return totals
+
+
+def summary_per_tutorial_parallel(infilename, outfilename, n_workers=None):
+    """Write the same file as summary_per_tutorial, parsing the input
+    with n_workers processes.
+    """
+    totals = tutorial_totals_parallel(infilename, n_workers)
+    with open(outfilename, "w") as file:
+        file.writelines(totals.lines())
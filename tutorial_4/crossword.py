@@ -1,3 +1,7 @@
+import io
+from functools import lru_cache
+
+
 def split_type(line):
     """Splits off the first word in the line and returns both parts in a tuple.
     Also eliminates all leading and trailing spaces.
@@ -109,34 +113,65 @@ def create_clue_string(clue):
     return f"({x},{y}) {direction}: {question} ({length})"
 
 
-def create_grid_string(grid):
-    """Return a crossword grid as a string."""
-    size = len(grid)
+@lru_cache(maxsize=None)
+def _grid_frame(size):
+    """Return the column number line and the separator line of a grid of
+    the given size.
+    """
     separator = "  +" + ("-----+") * size
-    column_number_line = "   "
-    column_number_line += "".join(f" {j:2}   " for j in range(size))
-    result = f"{column_number_line}\n{separator}\n"
+    column_number_line = "   " + "".join(f" {j:2}   " for j in range(size))
+    return column_number_line, separator
+
+
+def grid_lines(grid):
+    """Generate the lines of the string representation of a grid, without
+    their newlines.
+    """
+    column_number_line, separator = _grid_frame(len(grid))
+    yield column_number_line
+    yield separator
     for (i, row) in enumerate(grid):
-        fill = "  |"
-        centre_line = f"{i:2}|"
-        for entry in row:
-            if entry == "#":
-                fill += "#####|"
-                centre_line += "#####|"
-            else:
-                fill += "     |"
-                centre_line += f"  {entry}  |"
-        result += f"{fill}\n{centre_line}\n{fill}\n{separator}\n"
-    return result
+        fill = "  |" + "".join("#####|" if entry == "#" else "     |" for entry in row)
+        yield fill
+        yield f"{i:2}|" + "".join("#####|" if entry == "#" else f"  {entry}  |" for entry in row)
+        yield fill
+        yield separator
+
+
+def create_grid_string(grid):
+    """Return a crossword grid as a string."""
+    result = io.StringIO()
+    for line in grid_lines(grid):
+        result.write(line)
+        result.write("\n")
+    return result.getvalue()
+
+
+def write_puzzle_string(f, grid, clues):
+    """Write the string representation of the puzzle, as returned by
+    create_puzzle_string, to the open text file f.
+    """
+    f.write("\n".join(grid_lines(grid)))
+    if clues:
+        f.write("\n\n")
+        f.write("\n".join(create_clue_string(clue) for clue in clues))
 
 
 def create_puzzle_string(grid, clues):
     """Return a human readable string representation of the puzzle."""
-    result = create_grid_string(grid)
-    result += "\n"
-    for clue in clues:
-        result += create_clue_string(clue) + "\n"
-    return result.rstrip()
+    result = io.StringIO()
+    write_puzzle_string(result, grid, clues)
+    return result.getvalue()
+
+
+def write_puzzle_strings(f, puzzles, separator="\n\n"):
+    """Write the string representations of many (grid, clues) puzzles to
+    the open text file f, separated by separator.
+    """
+    for i, (grid, clues) in enumerate(puzzles):
+        if i:
+            f.write(separator)
+        write_puzzle_string(f, grid, clues)
 
 
 def fill_in_word(grid, word, position, direction):
@@ -177,10 +212,11 @@ def compare_two_files(filename1, filename2):
 
 def write_puzzle(filename, grid, clues):
     """Writes the puzzle given by the grid and by the clues to the specified
-    file.
+    file. filename may also be a file opened for writing text.
     """
+    if hasattr(filename, "write"):
+        filename.writelines(f"ROW {create_row_string(row)}\n" for row in grid)
+        filename.writelines(f"CLUE {create_clue_string(clue)}\n" for clue in clues)
+        return
     with open(filename, "w") as f:
-        for row in grid:
-            f.write(f"ROW {create_row_string(row)}\n")
-        for clue in clues:
-            f.write(f"CLUE {create_clue_string(clue)}\n")
+        write_puzzle(f, grid, clues)
@@ -0,0 +1,127 @@
+import struct
+from typing import List, Tuple
+
+import numpy as np
+
+from crossword import read_file, write_puzzle
+
+ARCHIVE_MAGIC = b"CWARC01\n"
+ARCHIVE_HEADER = struct.Struct("<8sQ")
+# Per puzzle: grid offset, number of rows, number of columns, clues offset, number of clues.
+PUZZLE_RECORD = struct.Struct("<QIIQI")
+# Per clue: x, y, direction, length, question offset, question size.
+CLUE_RECORD = struct.Struct("<iiBIQI")
+DIRECTIONS = ["down", "across"]
+
+
+def write_archive(filename, puzzles) -> int:
+    """Write the (grid, clues) puzzles to one archive file and return their
+    number. The file holds a header, one record per puzzle, then the grids
+    as one byte per cell, the clues as fixed-size records and their
+    questions in a UTF-8 string table. Grids must be rectangular.
+    """
+    records = []
+    grids = bytearray()
+    clue_records = bytearray()
+    strings = bytearray()
+    for grid, clues in puzzles:
+        n_columns = len(grid[0]) if grid else 0
+        if any(len(row) != n_columns for row in grid):
+            raise ValueError("Only rectangular grids can be archived")
+        records.append((len(grids), len(grid), n_columns, len(clue_records), len(clues)))
+        grids += "".join("".join(row) for row in grid).encode("ascii")
+        for (x, y), direction, length, question in clues:
+            if direction not in DIRECTIONS:
+                raise ValueError("Unknown direction: " + direction)
+            question = question.encode()
+            clue_records += CLUE_RECORD.pack(x, y, DIRECTIONS.index(direction), length, len(strings), len(question))
+            strings += question
+
+    # Offsets in the records are relative to their section until here.
+    grids_start = ARCHIVE_HEADER.size + PUZZLE_RECORD.size * len(records)
+    clues_start = grids_start + len(grids)
+    strings_start = clues_start + len(clue_records)
+    with open(filename, "wb") as f:
+        f.write(ARCHIVE_HEADER.pack(ARCHIVE_MAGIC, len(records)))
+        for grid_offset, n_rows, n_columns, clues_offset, n_clues in records:
+            f.write(
+                PUZZLE_RECORD.pack(grids_start + grid_offset, n_rows, n_columns, clues_start + clues_offset, n_clues)
+            )
+        f.write(grids)
+        for fields in CLUE_RECORD.iter_unpack(clue_records):
+            f.write(CLUE_RECORD.pack(*fields[:4], strings_start + fields[4], fields[5]))
+        f.write(strings)
+    return len(records)
+
+
+class PuzzleArchive:
+    """Random access to the puzzles of an archive written by
+    write_archive. The file is memory-mapped: opening it only reads the
+    header, and each grid or clue list is decoded when asked for.
+    Data attributes:
+    filename -- the archive file
+    data     -- the memory-mapped bytes of the file
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.data = np.memmap(filename, dtype=np.uint8, mode="r")
+        magic, self._n_puzzles = ARCHIVE_HEADER.unpack(self.data[: ARCHIVE_HEADER.size].tobytes())
+        if magic != ARCHIVE_MAGIC:
+            raise ValueError(f"{filename} is not a puzzle archive")
+
+    def __len__(self):
+        return self._n_puzzles
+
+    def __repr__(self):
+        return f"PuzzleArchive({self.filename!r}, {len(self)} puzzles)"
+
+    def _record(self, n) -> Tuple[int, int, int, int, int]:
+        if not 0 <= n < len(self):
+            raise IndexError("puzzle index out of range")
+        start = ARCHIVE_HEADER.size + PUZZLE_RECORD.size * n
+        return PUZZLE_RECORD.unpack(self.data[start : start + PUZZLE_RECORD.size].tobytes())
+
+    def grid(self, n) -> List[List[str]]:
+        """Return the grid of puzzle n."""
+        grid_offset, n_rows, n_columns, _, _ = self._record(n)
+        cells = self.data[grid_offset : grid_offset + n_rows * n_columns].tobytes().decode("ascii")
+        if n_columns == 0:
+            return [[] for _ in range(n_rows)]
+        return [list(cells[i : i + n_columns]) for i in range(0, len(cells), n_columns)]
+
+    def clues(self, n) -> List[Tuple[Tuple[int, int], str, int, str]]:
+        """Return the clues of puzzle n."""
+        _, _, _, clues_offset, n_clues = self._record(n)
+        records = self.data[clues_offset : clues_offset + CLUE_RECORD.size * n_clues].tobytes()
+        clues = []
+        for x, y, direction, length, question_offset, question_size in CLUE_RECORD.iter_unpack(records):
+            question = self.data[question_offset : question_offset + question_size].tobytes().decode()
+            clues.append(((x, y), DIRECTIONS[direction], length, question))
+        return clues
+
+    def __getitem__(self, n):
+        """Return puzzle n as a (grid, clues) pair, like read_file."""
+        if n < 0:
+            n += len(self)
+        return self.grid(n), self.clues(n)
+
+    def __iter__(self):
+        for n in range(len(self)):
+            yield self[n]
+
+
+def pack_files(filenames, archive_filename) -> int:
+    """Archive the puzzle text files, in order, and return their number."""
+    return write_archive(archive_filename, (read_file(filename) for filename in filenames))
+
+
+def unpack_archive(archive_filename, filename_pattern) -> List[str]:
+    """Write every puzzle of the archive back to a text file named
+    filename_pattern.format(n) and return the file names.
+    """
+    filenames = []
+    for n, (grid, clues) in enumerate(PuzzleArchive(archive_filename)):
+        filenames.append(filename_pattern.format(n))
+        write_puzzle(filenames[-1], grid, clues)
+    return filenames
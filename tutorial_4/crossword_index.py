@@ -0,0 +1,234 @@
+import argparse
+import random
+import struct
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+INDEX_MAGIC = b"CWIDX01\n"
+INDEX_HEADER = struct.Struct("<8sQ")
+LENGTH_RECORD = struct.Struct("<QQQQ")
+LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
+def naive_matching(words, pattern) -> List[str]:
+    """Return the words matching pattern by scanning the whole list. In
+    pattern, letters are fixed and any other character is free.
+    """
+    fixed = [(position, letter.upper()) for position, letter in enumerate(pattern) if letter.isalpha()]
+    return [
+        word
+        for word in words
+        if len(word) == len(pattern) and all(word[position] == letter for position, letter in fixed)
+    ]
+
+
+def _letter_bits(codes) -> np.ndarray:
+    """Return the (length, 26, n_blocks) uint64 array whose [position,
+    letter] row has bit i set when word i has that letter at that position.
+    codes is the (n_words, length) array of the letters of the words (0 for A).
+    """
+    n_words, length = codes.shape
+    n_blocks = (n_words + 63) // 64
+    bits = np.zeros((length, len(LETTERS), n_blocks * 8), dtype=np.uint8)
+    for position in range(length):
+        one_hot = codes[:, position, None] == np.arange(len(LETTERS))
+        packed = np.packbits(one_hot, axis=0, bitorder="little")
+        bits[position, :, : packed.shape[0]] = packed.T
+    return bits.view(np.uint64)
+
+
+class WordIndex:
+    """Letter-position index of a word list of capital letters A-Z. For
+    each length, the words are kept in a (n_words, length) byte array and
+    every (position, letter) is a bitset of word numbers, stored as uint64
+    blocks, so that a pattern query is the AND of one row per fixed letter.
+    An index saved with save is memory-mapped by load, so that opening a
+    large word list costs nothing until its rows are used.
+    Data attributes:
+    words -- dictionary mapping each length to its (n_words, length) uint8 array
+    bits  -- dictionary mapping each length to its (length, 26, n_blocks) uint64 array
+    """
+
+    def __init__(self, words=()):
+        by_length: Dict[int, List[str]] = {}
+        for word in words:
+            if not (word.isascii() and word.isalpha() and word.isupper()):
+                raise ValueError(f"Not a word of capital letters: {word!r}")
+            by_length.setdefault(len(word), []).append(word)
+        self.words: Dict[int, np.ndarray] = {}
+        self.bits: Dict[int, np.ndarray] = {}
+        for length, same_length in sorted(by_length.items()):
+            codes = np.frombuffer("".join(same_length).encode(), dtype=np.uint8).reshape(-1, length)
+            self.words[length] = codes
+            self.bits[length] = _letter_bits(codes - ord("A"))
+
+    def __len__(self):
+        return sum(len(codes) for codes in self.words.values())
+
+    def __repr__(self):
+        return f"WordIndex({len(self)} words, lengths {sorted(self.words)})"
+
+    def save(self, filename) -> None:
+        """Write the index to file: a header, one record per length giving
+        its number of words and the offsets of its arrays, then the arrays,
+        aligned on 8 bytes.
+        """
+        offset = INDEX_HEADER.size + LENGTH_RECORD.size * len(self.words)
+        records = []
+        for length in self.words:
+            words_offset = offset
+            bits_offset = -(-(words_offset + self.words[length].nbytes) // 8) * 8
+            offset = bits_offset + self.bits[length].nbytes
+            records.append((length, len(self.words[length]), words_offset, bits_offset))
+        with open(filename, "wb") as f:
+            f.write(INDEX_HEADER.pack(INDEX_MAGIC, len(records)))
+            for record in records:
+                f.write(LENGTH_RECORD.pack(*record))
+            for length, _, words_offset, bits_offset in records:
+                f.write(b"\0" * (words_offset - f.tell()))
+                f.write(self.words[length].tobytes())
+                f.write(b"\0" * (bits_offset - f.tell()))
+                f.write(self.bits[length].tobytes())
+
+    @classmethod
+    def load(cls, filename) -> "WordIndex":
+        """Memory-map an index written by save."""
+        data = np.memmap(filename, dtype=np.uint8, mode="r")
+        magic, n_lengths = INDEX_HEADER.unpack(data[: INDEX_HEADER.size].tobytes())
+        if magic != INDEX_MAGIC:
+            raise ValueError(f"{filename} is not a word index file")
+        index = cls()
+        for i in range(n_lengths):
+            start = INDEX_HEADER.size + LENGTH_RECORD.size * i
+            length, n_words, words_offset, bits_offset = LENGTH_RECORD.unpack(
+                data[start : start + LENGTH_RECORD.size].tobytes()
+            )
+            n_blocks = (n_words + 63) // 64
+            index.words[length] = data[words_offset : words_offset + n_words * length].reshape(n_words, length)
+            bits = data[bits_offset : bits_offset + length * len(LETTERS) * n_blocks * 8].view(np.uint64)
+            index.bits[length] = bits.reshape(length, len(LETTERS), n_blocks)
+        return index
+
+    def word(self, length, i) -> str:
+        """Return word number i of the given length."""
+        return self.words[length][i].tobytes().decode()
+
+    def word_list(self, length) -> List[str]:
+        """Return the words of the given length, in index order."""
+        codes = self.words.get(length)
+        if codes is None:
+            return []
+        data = codes.tobytes().decode()
+        return [data[i : i + length] for i in range(0, len(data), length)]
+
+    def pattern_bits(self, pattern) -> np.ndarray:
+        """Return the uint64 bitset blocks of the words matching pattern,
+        where letters are fixed and any other character is free.
+        """
+        length = len(pattern)
+        if length not in self.bits:
+            return np.zeros(0, dtype=np.uint64)
+        bits = self.bits[length]
+        fixed = [
+            (position, LETTERS.find(letter.upper())) for position, letter in enumerate(pattern) if letter.isalpha()
+        ]
+        if any(letter < 0 for _, letter in fixed):
+            return np.zeros(bits.shape[2], dtype=np.uint64)
+        if not fixed:
+            n_words = len(self.words[length])
+            result = np.full(bits.shape[2], np.iinfo(np.uint64).max, dtype=np.uint64)
+            if n_words % 64:
+                result[-1] = np.uint64((1 << (n_words % 64)) - 1)
+            return result
+        result = bits[fixed[0]].copy()
+        for position, letter in fixed[1:]:
+            result &= bits[position, letter]
+        return result
+
+    def matching_ids(self, pattern) -> np.ndarray:
+        """Return the numbers of the words matching pattern, increasing."""
+        blocks = self.pattern_bits(pattern)
+        return np.flatnonzero(np.unpackbits(blocks.view(np.uint8), bitorder="little"))
+
+    def matching(self, pattern) -> List[str]:
+        """Return the words matching pattern, in index order."""
+        codes = self.words.get(len(pattern))
+        if codes is None:
+            return []
+        return [row.tobytes().decode() for row in codes[self.matching_ids(pattern)]]
+
+    def count(self, pattern) -> int:
+        """Return the number of words matching pattern."""
+        return int(np.unpackbits(self.pattern_bits(pattern).view(np.uint8)).sum())
+
+    def letter_bitsets(self, length) -> Dict[Tuple[int, str], int]:
+        """Return the non-empty (position, letter) bitsets of the given
+        length as Python ints, bit i standing for word number i.
+        """
+        result = {}
+        for position, rows in enumerate(self.bits.get(length, ())):
+            for letter, row in zip(LETTERS, rows):
+                bitset = int.from_bytes(row.tobytes(), "little")
+                if bitset:
+                    result[position, letter] = bitset
+        return result
+
+
+def random_patterns(words, n_patterns, n_fixed=2, seed=0) -> List[str]:
+    """Return n_patterns patterns made from random words of the list, each
+    with n_fixed random letters kept and the others replaced by '.'.
+    """
+    rng = random.Random(seed)
+    patterns = []
+    for word in rng.choices(words, k=n_patterns):
+        kept = set(rng.sample(range(len(word)), min(n_fixed, len(word))))
+        patterns.append("".join(letter if i in kept else "." for i, letter in enumerate(word)))
+    return patterns
+
+
+def benchmark(words, patterns, index_file=None) -> Dict[str, float]:
+    """Time the pattern queries on words with a naive scan and with a
+    WordIndex, built in memory or memory-mapped from index_file, and
+    return the timings in seconds. Both must give the same words.
+    """
+    timings = {}
+    start = time.perf_counter()
+    index = WordIndex(words)
+    timings["build"] = time.perf_counter() - start
+    if index_file is not None:
+        index.save(index_file)
+        start = time.perf_counter()
+        index = WordIndex.load(index_file)
+        timings["load"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    expected = [naive_matching(words, pattern) for pattern in patterns]
+    timings["naive_query"] = (time.perf_counter() - start) / len(patterns)
+    start = time.perf_counter()
+    found = [index.matching(pattern) for pattern in patterns]
+    timings["index_query"] = (time.perf_counter() - start) / len(patterns)
+    if found != expected:
+        raise AssertionError("The index and the naive scan disagree")
+    return timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark crossword pattern queries.")
+    parser.add_argument("word_list", help="word list file, one word per line")
+    parser.add_argument("--index-file", help="save the index there and query the memory-mapped copy")
+    parser.add_argument("--patterns", type=int, default=200, help="number of random patterns")
+    parser.add_argument("--fixed", type=int, default=2, help="fixed letters per pattern")
+    args = parser.parse_args(argv)
+
+    from crossword_solver import read_word_list
+
+    words = [word for word in read_word_list(args.word_list) if word.isascii()]
+    patterns = random_patterns(words, args.patterns, args.fixed)
+    for name, seconds in benchmark(words, patterns, args.index_file).items():
+        print(f"{name:<12}{seconds * 1e6:14.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+from typing import Dict, List, Optional, Tuple
+
+from crossword import fill_in_word, read_file
+
+
+def read_word_list(filename) -> List[str]:
+    """Read a word list with one word per line, and return the distinct
+    words made of letters only, capitalized.
+    """
+    words = set()
+    with open(filename) as f:
+        for line in f:
+            word = line.strip()
+            if word.isalpha():
+                words.add(word.upper())
+    return sorted(words)
+
+
+class PatternIndex:
+    """Index of a word list for crossword pattern queries. Words are
+    grouped by length; a set of words of one length is a bitset (an int
+    whose bit i stands for words[length][i]).
+    Data attributes:
+    words   -- dictionary mapping each length to its list of words
+    all     -- dictionary mapping each length to the bitset of all its words
+    letters -- dictionary mapping (length, position) to a dictionary mapping
+               each letter to the bitset of the words of that length with
+               that letter at that position
+    """
+
+    def __init__(self, words):
+        self.words: Dict[int, List[str]] = {}
+        for word in words:
+            self.words.setdefault(len(word), []).append(word)
+        self.all = {length: (1 << len(words)) - 1 for length, words in self.words.items()}
+        self.letters: Dict[Tuple[int, int], Dict[str, int]] = {}
+        for length, words in self.words.items():
+            for i, word in enumerate(words):
+                for position, letter in enumerate(word):
+                    bitsets = self.letters.setdefault((length, position), {})
+                    bitsets[letter] = bitsets.get(letter, 0) | (1 << i)
+
+    @classmethod
+    def from_word_index(cls, word_index) -> "PatternIndex":
+        """Build the index from the bitsets of a crossword_index.WordIndex,
+        for instance one memory-mapped from disk, without rescanning the words.
+        """
+        index = cls(())
+        for length in word_index.words:
+            index.words[length] = word_index.word_list(length)
+            index.all[length] = (1 << len(index.words[length])) - 1
+            for (position, letter), bitset in word_index.letter_bitsets(length).items():
+                index.letters.setdefault((length, position), {})[letter] = bitset
+        return index
+
+    def matching(self, pattern) -> int:
+        """Return the bitset of the words matching pattern, a string or
+        list where letters are fixed and any other character is free.
+        """
+        length = len(pattern)
+        result = self.all.get(length, 0)
+        for position, letter in enumerate(pattern):
+            if letter.isalpha():
+                result &= self.letters.get((length, position), {}).get(letter.upper(), 0)
+        return result
+
+    def words_of(self, length, bitset) -> List[str]:
+        """Return the words of the given length in bitset."""
+        words = self.words.get(length, [])
+        result = []
+        while bitset:
+            low = bitset & -bitset
+            result.append(words[low.bit_length() - 1])
+            bitset ^= low
+        return result
+
+
+def clue_cells(clue) -> List[Tuple[int, int]]:
+    """Return the grid cells of the slot of clue, in word order."""
+    (x, y), direction, length, _ = clue
+    if direction == "down":
+        return [(x + i, y) for i in range(length)]
+    return [(x, y + i) for i in range(length)]
+
+
+class Solver:
+    """Crossword filler: backtracking search over the clue slots, always
+    filling the slot with the fewest candidate words left, keeping every
+    pair of crossing slots arc-consistent. Candidate sets are bitsets of a
+    PatternIndex.
+    """
+
+    def __init__(self, grid, clues, index):
+        self.grid = grid
+        self.clues = clues
+        self.index = index
+        self.lengths = [clue[2] for clue in clues]
+        # crossings[s] lists (t, i, j): letter i of slot s is letter j of slot t.
+        self.crossings: List[List[Tuple[int, int, int]]] = [[] for _ in clues]
+        owners: Dict[Tuple[int, int], List[Tuple[int, int]]] = {}
+        for s, clue in enumerate(clues):
+            for i, cell in enumerate(clue_cells(clue)):
+                for t, j in owners.get(cell, []):
+                    self.crossings[s].append((t, i, j))
+                    self.crossings[t].append((s, j, i))
+                owners.setdefault(cell, []).append((s, i))
+
+    def _supported(self, s, i, t, j, domain_t) -> int:
+        """Return the bitset of words of slot s whose letter i is letter j
+        of some word of domain_t.
+        """
+        result = 0
+        letters_s = self.index.letters[self.lengths[s], i]
+        for letter, bitset in self.index.letters[self.lengths[t], j].items():
+            if bitset & domain_t:
+                result |= letters_s.get(letter, 0)
+        return result
+
+    def propagate(self, domains, queue) -> bool:
+        """Make domains arc-consistent (AC-3), starting from the slots in
+        queue. Return False if some slot has no candidate left.
+        """
+        queue = list(queue)
+        queued = set(queue)
+        while queue:
+            t = queue.pop()
+            queued.discard(t)
+            for s, j, i in self.crossings[t]:
+                # Arc (s, t): letter i of slot s is letter j of slot t.
+                domain = domains[s] & self._supported(s, i, t, j, domains[t])
+                if domain != domains[s]:
+                    if not domain:
+                        return False
+                    domains[s] = domain
+                    if s not in queued:
+                        queue.append(s)
+                        queued.add(s)
+        return True
+
+    def initial_domains(self) -> Optional[List[int]]:
+        """Return the candidate bitsets of the slots given the letters
+        already in the grid, or None if some slot has no candidate.
+        """
+        domains = []
+        for clue in self.clues:
+            pattern = [self.grid[x][y] for x, y in clue_cells(clue)]
+            domains.append(self.index.matching(pattern))
+        if not all(domains) or not self.propagate(domains, range(len(domains))):
+            return None
+        return domains
+
+    def solve(self) -> Optional[List[str]]:
+        """Return a word for every clue, or None if there is no solution.
+        A word is used at most once.
+        """
+        domains = self.initial_domains()
+        if domains is None:
+            return None
+        return self._search(domains, [None] * len(self.clues))
+
+    def _search(self, domains, assignment) -> Optional[List[str]]:
+        unassigned = [s for s, word in enumerate(assignment) if word is None]
+        if not unassigned:
+            return assignment
+        s = min(unassigned, key=lambda slot: bin(domains[slot]).count("1"))
+        used = set(word for word in assignment if word is not None)
+        length = self.lengths[s]
+        for word in self.index.words_of(length, domains[s]):
+            if word in used:
+                continue
+            new_domains = list(domains)
+            new_domains[s] = self.index.matching(word) & domains[s]
+            if self.propagate(new_domains, [s]):
+                assignment[s] = word
+                result = self._search(new_domains, assignment)
+                if result is not None:
+                    return result
+                assignment[s] = None
+        return None
+
+
+def solve(grid, clues, words) -> Optional[List[List[str]]]:
+    """Return a new grid with every clue slot filled with a word of words
+    (a list or a PatternIndex), or None if there is no solution.
+    """
+    index = words if isinstance(words, PatternIndex) else PatternIndex(words)
+    answers = Solver(grid, clues, index).solve()
+    if answers is None:
+        return None
+    filled = [list(row) for row in grid]
+    for clue, word in zip(clues, answers):
+        position, direction, _, _ = clue
+        fill_in_word(filled, word, position, direction)
+    return filled
+
+
+def solve_file(filename, words) -> Optional[List[List[str]]]:
+    """Read the puzzle in filename and return its solved grid, or None."""
+    grid, clues = read_file(filename)
+    return solve(grid, clues, words)
@@ -1,6 +1,79 @@
-from collections import defaultdict
-from sys import stdout
-from typing import Dict, List, Tuple, Union
+import os
+from collections import OrderedDict, defaultdict
+from sys import getsizeof, stdout
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Tuple, Union
+
+CACHE_BYTES = 64 << 20
+
+
+class ParsedFileCache:
+    """LRU cache of parsed recipe, fridge and market files. An entry is
+    reused while the modification time and size of its file are
+    unchanged. Entries are immutable views, so that callers cannot alter
+    the cached data. The least recently used entries are dropped when the
+    estimated size of the cached data exceeds max_bytes.
+    Data attributes:
+    max_bytes -- bound on the estimated size of the cached data
+    entries   -- OrderedDict mapping (parser name, absolute path) to
+                 ((mtime, size), view, estimated size), oldest first
+    n_bytes   -- estimated size of the cached data
+    hits      -- number of lookups answered from the cache
+    misses    -- number of lookups that parsed the file
+    """
+
+    def __init__(self, max_bytes=CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.n_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __repr__(self):
+        return (
+            f"ParsedFileCache({len(self.entries)} files, {self.n_bytes} bytes, "
+            f"{self.hits} hits, {self.misses} misses)"
+        )
+
+    def get(self, file_name, parse) -> Mapping[str, int]:
+        """Return an immutable view of parse(file_name), parsing the file
+        only if it is not cached or has changed since it was cached.
+        """
+        stat = os.stat(file_name)
+        version = (stat.st_mtime_ns, stat.st_size)
+        key = (parse.__name__, os.path.abspath(file_name))
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] == version:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return entry[1]
+
+        self.misses += 1
+        parsed = parse(file_name)
+        view = MappingProxyType(parsed)
+        self.discard(key)
+        size = getsizeof(parsed) + sum(getsizeof(name) + getsizeof(amount) for name, amount in parsed.items())
+        if size <= self.max_bytes:
+            self.entries[key] = (version, view, size)
+            self.n_bytes += size
+            while self.n_bytes > self.max_bytes:
+                _, (_, _, oldest_size) = self.entries.popitem(last=False)
+                self.n_bytes -= oldest_size
+        return view
+
+    def discard(self, key) -> None:
+        """Drop the entry of key, if any."""
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.n_bytes -= entry[2]
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+        self.entries.clear()
+        self.n_bytes = self.hits = self.misses = 0
+
+
+FILE_CACHE = ParsedFileCache()
 
 
 def print_recipe(recipe) -> None:
@@ -11,11 +84,17 @@ def print_recipe(recipe) -> None:
         print(f"{ingredient}: {amount}")
 
 
-def read_recipe(recipe_file_name) -> Dict[str, int]:
+def read_recipe(recipe_file_name) -> Mapping[str, int]:
     """Read recipe file 'recipe_file_name', and return ingredients as a
     dictionary whose keys are ingredients and whose values are the
     corresponding amounts.
+    The result is a read-only view, cached in FILE_CACHE.
     """
+    return FILE_CACHE.get(recipe_file_name, _parse_recipe)
+
+
+def _parse_recipe(recipe_file_name) -> Dict[str, int]:
+    """Parse the recipe file for read_recipe."""
     recipe = {}
     with open(recipe_file_name) as recipe_file:
         for line in recipe_file:
@@ -34,10 +113,16 @@ def write_recipe(recipe, recipe_file_name) -> None:
             recipe_file.write(f"{ingredient},{amount}\n")
 
 
-def read_fridge(fridge_file_name) -> Dict[str, int]:
+def read_fridge(fridge_file_name) -> Mapping[str, int]:
     """Read fridge file 'fridge_file_name', and return the ingredients
     held in the given fridge as an ingredient=amount dictionary.
+    The result is a read-only view, cached in FILE_CACHE.
     """
+    return FILE_CACHE.get(fridge_file_name, _parse_fridge)
+
+
+def _parse_fridge(fridge_file_name) -> Dict[str, int]:
+    """Parse the fridge file for read_fridge."""
     fridge = defaultdict(int)
     with open(fridge_file_name) as fridge_file:
         for line in fridge_file:
@@ -88,10 +173,16 @@ def create_shopping_list(recipe_file_names, fridge_file_name) -> Dict[str, int]:
     return {product: amount for product, amount in shopping_list.items() if amount > 0}
 
 
-def read_market(market_filename) -> Dict[str, int]:
+def read_market(market_filename) -> Mapping[str, int]:
     """Return a dictionary mapping ingredients to their prices in
     millicents.
+    The result is a read-only view, cached in FILE_CACHE.
     """
+    return FILE_CACHE.get(market_filename, _parse_market)
+
+
+def _parse_market(market_filename) -> Dict[str, int]:
+    """Parse the market file for read_market."""
     market = {}
     with open(market_filename) as market_file:
         for line in market_file:
@@ -0,0 +1,211 @@
+from typing import Dict, Tuple
+
+import numpy as np
+
+from shopping_catalog import MarketCatalog
+
+MAX_ASCENT_ROUNDS = 100
+# Dual ascent stops once a round raises the bound by less than this.
+MIN_ASCENT_STEP = 0.25
+ASCENT_TOLERANCE = 1e-6
+
+
+def _assign(costs, open_markets) -> np.ndarray:
+    """Return, for every ingredient, the first cheapest of open_markets."""
+    masked = np.where(open_markets, costs, np.inf)
+    return np.argmin(masked, axis=1)
+
+
+def _savings(reference, costs) -> np.ndarray:
+    """Return, for every column of costs, how much buying at that market
+    saves over paying the reference price of every ingredient; reference
+    is a vector, or a matrix giving a reference per ingredient and market.
+    """
+    if reference.ndim == 1:
+        reference = reference[:, None]
+    stocked = ~np.isinf(costs)
+    return np.where(stocked, np.maximum(reference - np.where(stocked, costs, 0), 0), 0).sum(axis=0)
+
+
+def _plan_cost(costs, visit_costs, open_markets) -> float:
+    """Return the cost of buying everything at the cheapest of open_markets."""
+    return visit_costs[open_markets].sum() + np.where(open_markets, costs, np.inf).min(axis=1).sum()
+
+
+class _BasketSearch:
+    """Exact branch and bound over the sets of markets to visit (the
+    uncapacitated facility location problem). Every node fixes some
+    markets open and some closed; the others are undecided. At each node,
+    Khumawala's rules decide the undecided markets whose visit cost is at
+    least the most they can save, or at most the least they will save,
+    and the node is pruned when its dual ascent lower bound reaches the
+    best plan found so far.
+    """
+
+    def __init__(self, costs, visit_costs):
+        self.costs = costs
+        self.visit_costs = visit_costs
+        self.best_open = None
+        self.best_cost = np.inf
+
+    def _greedy(self) -> None:
+        """Set a first plan: start from every market that is the cheapest
+        for some ingredient, and close markets while it lowers the cost.
+        """
+        open_markets = np.zeros(len(self.visit_costs), dtype=bool)
+        open_markets[_assign(self.costs, np.ones_like(open_markets))] = True
+        cost = _plan_cost(self.costs, self.visit_costs, open_markets)
+        while True:
+            best = None
+            for j in np.flatnonzero(open_markets):
+                open_markets[j] = False
+                new_cost = _plan_cost(self.costs, self.visit_costs, open_markets)
+                open_markets[j] = True
+                if new_cost < cost:
+                    best, cost = j, new_cost
+            if best is None:
+                break
+            open_markets[best] = False
+        self.best_open, self.best_cost = open_markets, cost
+
+    def _reduce(self, open_markets, undecided) -> bool:
+        """Apply the closing and opening rules to every undecided market at
+        once, and again until none applies. Return False if the node is
+        infeasible.
+        """
+        costs, visit_costs = self.costs, self.visit_costs
+        while undecided.any():
+            available = open_markets | undecided
+            ordered = np.sort(np.where(available, costs, np.inf), axis=1)
+            if np.isinf(ordered[:, 0]).any():
+                return False
+            candidates = np.flatnonzero(undecided)
+            columns = costs[:, candidates]
+            cheapest_open = np.where(open_markets, costs, np.inf).min(axis=1)
+            close = visit_costs[candidates] >= _savings(cheapest_open, columns)
+            # The cheapest price without the market, over every market not closed.
+            cheapest = ordered[:, :1]
+            second = ordered[:, 1:2] if ordered.shape[1] > 1 else np.full_like(cheapest, np.inf)
+            without = np.where(columns == cheapest, second, cheapest)
+            open_ = ~close & (visit_costs[candidates] <= _savings(without, columns))
+            if not (close.any() or open_.any()):
+                break
+            undecided[candidates[close | open_]] = False
+            open_markets[candidates[open_]] = True
+        return not np.isinf(np.where(open_markets | undecided, costs, np.inf).min(axis=1)).any()
+
+    def _dual_bound(self, open_markets, undecided) -> float:
+        """Return a lower bound on the cost of the plans of the node, by
+        dual ascent (Erlenkotter): every ingredient gets a price v, at
+        first its cheapest price, and v is raised as long as, for every
+        market, the sum of v minus the market's price over the ingredients
+        it sells at most at v stays within its visit cost (zero for open
+        markets, whose cost is already counted). All ingredients are
+        raised together, to their next price level at most, each market's
+        remaining visit cost being shared among the ingredients raised
+        against it.
+        """
+        available = open_markets | undecided
+        costs = self.costs[:, available]
+        slack = np.where(open_markets[available], 0.0, self.visit_costs[available])
+        v = costs.min(axis=1)
+        for _ in range(MAX_ASCENT_ROUNDS):
+            tight = costs <= v[:, None]
+            gap = np.where(tight, np.inf, costs).min(axis=1) - v
+            blocked = (tight & (slack <= 0)).any(axis=1) | (gap <= 0)
+            rising = tight & ~blocked[:, None]
+            n_rising = rising.sum(axis=0)
+            share = np.where(n_rising > 0, slack / np.maximum(n_rising, 1), np.inf)
+            step = np.where(blocked, 0, np.minimum(gap, np.where(rising, share, np.inf).min(axis=1)))
+            if step.sum() < MIN_ASCENT_STEP:
+                break
+            v += step
+            slack = np.maximum(slack - (rising * step[:, None]).sum(axis=0), 0)
+        self._slack = np.full(len(available), np.inf)
+        self._slack[available] = slack
+        return self.visit_costs[open_markets].sum() + v.sum()
+
+    def search(self, open_markets, undecided) -> None:
+        open_markets, undecided = open_markets.copy(), undecided.copy()
+        if not self._reduce(open_markets, undecided):
+            return
+        if not undecided.any():
+            cost = _plan_cost(self.costs, self.visit_costs, open_markets)
+            if cost < self.best_cost:
+                self.best_open, self.best_cost = open_markets, cost
+            return
+        # Costs are integers: a plan under the best one saves at least 1.
+        if self._dual_bound(open_markets, undecided) > self.best_cost - 1 + ASCENT_TOLERANCE:
+            return
+        # Branch on the undecided market that would save the most now, among
+        # those whose visit cost the dual ascent used up if there are any.
+        # Ingredients no open market sells are priced at their dearest market.
+        reference = np.where(open_markets, self.costs, np.inf).min(axis=1)
+        dearest = np.where(np.isinf(self.costs), -np.inf, self.costs).max(axis=1)
+        reference = np.where(np.isinf(reference), dearest, reference)
+        candidates = np.flatnonzero(undecided)
+        savings = _savings(reference, self.costs[:, candidates]) - self.visit_costs[candidates]
+        j = int(candidates[np.lexsort((-savings, self._slack[candidates] > ASCENT_TOLERANCE))[0]])
+        undecided[j] = False
+        open_markets[j] = True
+        self.search(open_markets, undecided)
+        open_markets[j] = False
+        self.search(open_markets, undecided)
+
+    def solve(self) -> np.ndarray:
+        """Return the boolean array of the markets of an optimal plan."""
+        n_markets = len(self.visit_costs)
+        self._greedy()
+        self.search(np.zeros(n_markets, dtype=bool), np.ones(n_markets, dtype=bool))
+        return self.best_open
+
+
+def split_basket(shopping_list, catalog, visit_costs=None) -> Tuple[Dict[str, Dict[str, int]], int]:
+    """Return the cheapest way to buy shopping_list across the markets of
+    catalog, a MarketCatalog (or a list of market file names), buying each
+    ingredient at one market. visit_costs, if given, is a dictionary
+    mapping market names to the cost in millicents of visiting them, or
+    a single cost for every market; the markets to visit are then chosen
+    exactly by branch and bound. Return the plan, a dictionary mapping the
+    visited markets to the ingredients and amounts to buy there, and its
+    total cost in millicents, visit costs included. Ties go to the first
+    market. Raise KeyError if no market sells an ingredient.
+    """
+    if not isinstance(catalog, MarketCatalog):
+        catalog = MarketCatalog(catalog)
+    ingredients = list(shopping_list)
+    ids = catalog.vocabulary.lookup(ingredients)
+    for ingredient, i in zip(ingredients, ids):
+        if i < 0 or not catalog.stocked[i].any():
+            raise KeyError(ingredient)
+    amounts = np.array(list(shopping_list.values()), dtype=np.int64)
+    prices = catalog.prices[ids]
+    costs = np.where(catalog.stocked[ids], amounts[:, None] * prices, np.inf)
+
+    n_markets = len(catalog.names)
+    if visit_costs is None:
+        fees = np.zeros(n_markets, dtype=np.int64)
+    elif isinstance(visit_costs, dict):
+        fees = np.array([visit_costs.get(name, 0) for name in catalog.names], dtype=np.int64)
+    else:
+        fees = np.full(n_markets, visit_costs, dtype=np.int64)
+    if (fees < 0).any():
+        raise ValueError("Visit costs must not be negative")
+
+    if not ingredients:
+        return {}, 0
+    if fees.any():
+        open_markets = _BasketSearch(costs, fees.astype(np.float64)).solve()
+    else:
+        open_markets = np.ones(n_markets, dtype=bool)
+    markets = _assign(costs, open_markets).tolist()
+
+    plan: Dict[str, Dict[str, int]] = {}
+    total = 0
+    for j in sorted(set(markets)):
+        plan[catalog.names[j]] = {}
+        total += int(fees[j])
+    for ingredient, amount, price, j in zip(ingredients, amounts.tolist(), prices.tolist(), markets):
+        plan[catalog.names[j]][ingredient] = amount
+        total += amount * price[j]
+    return plan, total
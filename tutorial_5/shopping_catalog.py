@@ -0,0 +1,111 @@
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+
+from shopping import read_market
+
+
+class Vocabulary:
+    """Interning of ingredient names to consecutive integer IDs.
+    Data attributes:
+    ids   -- dictionary mapping each ingredient to its ID
+    names -- list of the ingredients, indexed by ID
+    """
+
+    def __init__(self, names=()):
+        self.ids: Dict[str, int] = {}
+        self.names: List[str] = []
+        for name in names:
+            self.intern(name)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.ids
+
+    def intern(self, name) -> int:
+        """Return the ID of name, giving it a new one if it has none."""
+        if name not in self.ids:
+            self.ids[name] = len(self.names)
+            self.names.append(name)
+        return self.ids[name]
+
+    def lookup(self, names) -> np.ndarray:
+        """Return the array of the IDs of names, -1 for unknown names."""
+        return np.array([self.ids.get(name, -1) for name in names], dtype=np.intp)
+
+
+class MarketCatalog:
+    """Prices of many markets, read once, as an ingredients x markets
+    matrix, so that the price of a shopping list at every market is one
+    vector-matrix product.
+    Data attributes:
+    names      -- list of the market names, in the given order
+    vocabulary -- Vocabulary of the ingredients sold by some market
+    prices     -- int64 array of shape (ingredients, markets) of prices in
+                  millicents, 0 where the market does not sell the ingredient
+    stocked    -- bool array of the same shape, True where it does
+    """
+
+    def __init__(self, market_file_names):
+        markets = [read_market(market_file_name) for market_file_name in market_file_names]
+        self.names = [str(market_file_name) for market_file_name in market_file_names]
+        self.vocabulary = Vocabulary(ingredient for market in markets for ingredient in market)
+        self.prices = np.zeros((len(self.vocabulary), len(markets)), dtype=np.int64)
+        self.stocked = np.zeros(self.prices.shape, dtype=bool)
+        for j, market in enumerate(markets):
+            ids = self.vocabulary.lookup(market)
+            self.prices[ids, j] = list(market.values())
+            self.stocked[ids, j] = True
+
+    def __repr__(self):
+        return f"MarketCatalog({len(self.names)} markets, {len(self.vocabulary)} ingredients)"
+
+    def _check_stocked(self, ingredients, ids) -> None:
+        """Raise the KeyError total_price would raise if a market lacks one
+        of the ingredients: for the first such market, the first missing
+        ingredient in shopping list order.
+        """
+        known = ids >= 0
+        stocked = np.zeros((len(ids), len(self.names)), dtype=bool)
+        stocked[known] = self.stocked[ids[known]]
+        complete = stocked.all(axis=0)
+        if not complete.all():
+            market = int(np.argmin(complete))
+            raise KeyError(ingredients[int(np.argmin(stocked[:, market]))])
+
+    def total_prices(self, shopping_list) -> np.ndarray:
+        """Return the total price in millicents of shopping_list at every
+        market, as total_price computes it.
+        """
+        ingredients = list(shopping_list)
+        ids = self.vocabulary.lookup(ingredients)
+        self._check_stocked(ingredients, ids)
+        amounts = np.array(list(shopping_list.values()), dtype=np.int64)
+        return amounts @ self.prices[ids] if ingredients else np.zeros(len(self.names), dtype=np.int64)
+
+    def find_cheapest(self, shopping_list) -> Union[Tuple[str, int], None]:
+        """Return the same result as find_cheapest(shopping_list, market_file_names)."""
+        if not self.names:
+            return None
+        totals = self.total_prices(shopping_list)
+        market = int(np.argmin(totals))
+        return self.names[market], int(totals[market])
+
+    def find_cheapest_many(self, shopping_lists) -> List[Union[Tuple[str, int], None]]:
+        """Return find_cheapest for every shopping list, pricing them all
+        with one matrix product.
+        """
+        if not self.names:
+            return [None for _ in shopping_lists]
+        n_ingredients = len(self.vocabulary)
+        amounts = np.zeros((len(shopping_lists), n_ingredients), dtype=np.int64)
+        for i, shopping_list in enumerate(shopping_lists):
+            ingredients = list(shopping_list)
+            ids = self.vocabulary.lookup(ingredients)
+            self._check_stocked(ingredients, ids)
+            np.add.at(amounts[i], ids, list(shopping_list.values()))
+        totals = amounts @ self.prices
+        markets = np.argmin(totals, axis=1).tolist()
+        return [(self.names[market], int(totals[i, market])) for i, market in enumerate(markets)]
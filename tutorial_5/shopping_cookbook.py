@@ -0,0 +1,141 @@
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from shopping import read_fridge, read_recipe
+from shopping_catalog import Vocabulary
+
+
+def _sparse_rows(rows, vocabulary) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Encode the ingredient=amount mappings of rows as a compressed
+    sparse row matrix over vocabulary, interning new ingredients: return
+    the (indptr, indices, amounts) arrays, row r holding the entries
+    indptr[r]:indptr[r + 1].
+    """
+    indptr = np.zeros(len(rows) + 1, dtype=np.intp)
+    indices: List[int] = []
+    amounts: List[int] = []
+    for r, row in enumerate(rows):
+        indices.extend(vocabulary.intern(ingredient) for ingredient in row)
+        amounts.extend(row.values())
+        indptr[r + 1] = len(indices)
+    return indptr, np.array(indices, dtype=np.intp), np.array(amounts, dtype=np.int64)
+
+
+class Cookbook:
+    """Recipes and fridges encoded as sparse ingredient-amount vectors
+    over a shared Vocabulary, to answer many is_cookable questions at once.
+    Recipes are kept row by row, so that checking every recipe against a
+    fridge is one vectorized comparison of their entries with the fridge's
+    dense vector. Fridges are also kept column by column, an inverted index
+    from each ingredient to the fridges holding it sorted by amount, so
+    that the fridges able to cook a recipe are found with one binary
+    search per ingredient of the recipe.
+    Data attributes:
+    vocabulary    -- the Vocabulary of every ingredient
+    recipe_names  -- list of the recipe names
+    fridge_names  -- list of the fridge names
+    recipes       -- (indptr, indices, amounts) of the recipes, see _sparse_rows
+    fridges       -- (indptr, indices, amounts) of the fridges
+    holders       -- dictionary mapping an ingredient ID to the arrays of
+                     the fridges holding it and of their amounts, by amount
+    """
+
+    def __init__(self, recipes, fridges):
+        self.vocabulary = Vocabulary()
+        self.recipe_names = list(recipes)
+        self.fridge_names = list(fridges)
+        self._recipe_rows = {name: r for r, name in enumerate(self.recipe_names)}
+        self._fridge_rows = {name: f for f, name in enumerate(self.fridge_names)}
+        self.recipes = _sparse_rows(list(recipes.values()), self.vocabulary)
+        self.fridges = _sparse_rows(list(fridges.values()), self.vocabulary)
+        self._recipe_of_entry = np.repeat(np.arange(len(self.recipe_names)), np.diff(self.recipes[0]))
+
+        indptr, indices, amounts = self.fridges
+        rows = np.repeat(np.arange(len(self.fridge_names)), np.diff(indptr))
+        order = np.lexsort((amounts, indices))
+        ids, starts = np.unique(indices[order], return_index=True)
+        ends = np.append(starts[1:], len(order))
+        self.holders: Dict[int, Tuple[np.ndarray, np.ndarray]] = {
+            i: (rows[order[start:end]], amounts[order[start:end]])
+            for i, start, end in zip(ids.tolist(), starts.tolist(), ends.tolist())
+        }
+
+    @classmethod
+    def from_files(cls, recipe_file_names, fridge_file_names) -> "Cookbook":
+        """Read the recipe and fridge files, named by their file names."""
+        return cls(
+            {str(name): read_recipe(name) for name in recipe_file_names},
+            {str(name): read_fridge(name) for name in fridge_file_names},
+        )
+
+    def __repr__(self):
+        return (
+            f"Cookbook({len(self.recipe_names)} recipes, {len(self.fridge_names)} fridges, "
+            f"{len(self.vocabulary)} ingredients)"
+        )
+
+    def _fridge_vector(self, fridge) -> np.ndarray:
+        """Return the dense amount vector of fridge, a fridge name or an
+        ingredient=amount mapping.
+        """
+        vector = np.zeros(len(self.vocabulary), dtype=np.int64)
+        if isinstance(fridge, str):
+            indptr, indices, amounts = self.fridges
+            f = self._fridge_rows[fridge]
+            entries = slice(indptr[f], indptr[f + 1])
+            vector[indices[entries]] = amounts[entries]
+        else:
+            for ingredient, amount in fridge.items():
+                if ingredient in self.vocabulary:
+                    vector[self.vocabulary.ids[ingredient]] += amount
+        return vector
+
+    def cookable_mask(self, fridge) -> np.ndarray:
+        """Return the boolean array telling, for every recipe, whether
+        is_cookable holds with fridge, a fridge name or mapping.
+        """
+        _, indices, amounts = self.recipes
+        missing = self._recipe_of_entry[self._fridge_vector(fridge)[indices] < amounts]
+        cookable = np.ones(len(self.recipe_names), dtype=bool)
+        cookable[missing] = False
+        return cookable
+
+    def cookable_recipes(self, fridge) -> List[str]:
+        """Return the names of the recipes that can be cooked from fridge,
+        a fridge name or mapping.
+        """
+        return [self.recipe_names[r] for r in np.flatnonzero(self.cookable_mask(fridge))]
+
+    def fridges_for(self, recipe) -> List[str]:
+        """Return the names of the fridges from which recipe, a recipe name
+        or mapping, can be cooked.
+        """
+        if isinstance(recipe, str):
+            indptr, indices, amounts = self.recipes
+            r = self._recipe_rows[recipe]
+            entries = slice(indptr[r], indptr[r + 1])
+            needed = dict(zip(indices[entries].tolist(), amounts[entries].tolist()))
+        else:
+            needed = {}
+            for ingredient, amount in recipe.items():
+                if ingredient not in self.vocabulary:
+                    if amount > 0:
+                        return []
+                    continue
+                needed[self.vocabulary.ids[ingredient]] = amount
+
+        n_fridges = len(self.fridge_names)
+        enough = np.zeros(n_fridges, dtype=np.intp)
+        n_positive = 0
+        lacking = np.zeros(n_fridges, dtype=bool)
+        for i, amount in needed.items():
+            holders, held = self.holders.get(i, (np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.int64)))
+            if amount > 0:
+                # Fridges without the ingredient hold 0 of it.
+                n_positive += 1
+                enough[holders[np.searchsorted(held, amount, side="left") :]] += 1
+            else:
+                lacking[holders[: np.searchsorted(held, amount, side="left")]] = True
+        cookable = (enough == n_positive) & ~lacking
+        return [self.fridge_names[f] for f in np.flatnonzero(cookable)]
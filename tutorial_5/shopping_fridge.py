@@ -0,0 +1,194 @@
+import hashlib
+import json
+import os
+from types import MappingProxyType
+from typing import Dict, Mapping, Tuple, Union
+
+from shopping import add_recipes, find_cheapest, read_fridge, read_recipe, write_recipe
+
+COMPACT_EVERY = 10000
+
+
+def _digest(file_name) -> str:
+    """Return the hash of the contents of the file, or of nothing if it
+    does not exist.
+    """
+    try:
+        with open(file_name, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except FileNotFoundError:
+        return hashlib.sha256(b"").hexdigest()
+
+
+def _replace(file_name, write) -> None:
+    """Atomically replace file_name by the file that write(temporary_file_name)
+    creates, syncing it to disk first.
+    """
+    temporary_file_name = file_name + ".tmp"
+    write(temporary_file_name)
+    fd = os.open(temporary_file_name, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(temporary_file_name, file_name)
+
+
+class FridgeStore:
+    """Fridge whose changes are appended to a log instead of rewriting the
+    fridge file. The fridge file stays a snapshot in the read_fridge
+    format; fridge_file_name + ".log" holds one JSON line per transaction,
+    a dictionary of ingredient=amount changes, after a header line naming
+    the hash of the snapshot it applies to. Every compact_every
+    transactions, and on close, the current contents are written as the
+    new snapshot and the log is restarted.
+    A crash leaves at most a partial last line in the log, which is
+    dropped when the store is opened again; a crash during compaction is
+    detected by the header no longer matching the snapshot, in which case
+    the log is already part of the snapshot. Transactions are flushed to
+    the operating system as they are written, and also synced to disk if
+    durable is True.
+    Data attributes:
+    fridge_file_name -- the snapshot file
+    log_file_name    -- the log file
+    compact_every    -- number of transactions between compactions
+    durable          -- whether every transaction is synced to disk
+    n_logged         -- number of transactions in the log
+    """
+
+    def __init__(self, fridge_file_name, compact_every=COMPACT_EVERY, durable=False):
+        self.fridge_file_name = str(fridge_file_name)
+        self.log_file_name = self.fridge_file_name + ".log"
+        self.compact_every = compact_every
+        self.durable = durable
+        self._contents: Dict[str, int] = {}
+        if os.path.exists(self.fridge_file_name):
+            self._contents.update(read_fridge(self.fridge_file_name))
+        self.n_logged = 0
+        self._recover()
+        self._log = open(self.log_file_name, "ab")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __repr__(self):
+        return f"FridgeStore({self.fridge_file_name!r}, {len(self._contents)} ingredients, {self.n_logged} logged)"
+
+    def _recover(self) -> None:
+        """Apply the transactions of the log, dropping a partial last line,
+        or start a new log if there is none or it is already compacted.
+        """
+        digest = _digest(self.fridge_file_name)
+        try:
+            with open(self.log_file_name, "rb") as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            lines = []
+        try:
+            header = json.loads(lines[0]) if lines and lines[0].endswith(b"\n") else {}
+        except ValueError:
+            header = {}
+        if header.get("snapshot") != digest:
+            self._restart_log(digest)
+            return
+        valid_bytes = len(lines[0])
+        for line in lines[1:]:
+            try:
+                changes = json.loads(line) if line.endswith(b"\n") else None
+            except ValueError:
+                changes = None
+            if changes is None:
+                break
+            self._apply(changes)
+            self.n_logged += 1
+            valid_bytes += len(line)
+        with open(self.log_file_name, "r+b") as f:
+            f.truncate(valid_bytes)
+
+    def _restart_log(self, digest) -> None:
+        """Replace the log by an empty one for the snapshot of the given hash."""
+
+        def write(file_name):
+            with open(file_name, "w") as f:
+                f.write(json.dumps({"snapshot": digest}) + "\n")
+
+        _replace(self.log_file_name, write)
+        self.n_logged = 0
+
+    def _apply(self, changes) -> None:
+        for ingredient, amount in changes.items():
+            self._contents[ingredient] = self._contents.get(ingredient, 0) + amount
+
+    def contents(self) -> Mapping[str, int]:
+        """Return a read-only view of the current fridge contents."""
+        return MappingProxyType(self._contents)
+
+    def amount(self, ingredient) -> int:
+        """Return the current amount of ingredient."""
+        return self._contents.get(ingredient, 0)
+
+    def add(self, changes) -> None:
+        """Record, as one transaction, the ingredient=amount changes, with
+        negative amounts for what is taken out of the fridge.
+        """
+        changes = {ingredient: amount for ingredient, amount in changes.items() if amount != 0}
+        if not changes:
+            return
+        self._log.write(json.dumps(changes).encode() + b"\n")
+        self._log.flush()
+        if self.durable:
+            os.fsync(self._log.fileno())
+        self._apply(changes)
+        self.n_logged += 1
+        if self.n_logged >= self.compact_every:
+            self.compact()
+
+    def buy(self, shopping_list) -> None:
+        """Record the purchase of shopping_list."""
+        self.add(shopping_list)
+
+    def cook(self, recipe) -> None:
+        """Record cooking recipe, a dictionary or a recipe file name, by
+        taking its ingredients out of the fridge. Raise ValueError if the
+        fridge does not hold enough of them.
+        """
+        if not isinstance(recipe, Mapping):
+            recipe = read_recipe(recipe)
+        for ingredient, amount in recipe.items():
+            if self.amount(ingredient) < amount:
+                raise ValueError(f"Not enough {ingredient} to cook the recipe")
+        self.add({ingredient: -amount for ingredient, amount in recipe.items()})
+
+    def shop_for(self, recipe_file_names, market_file_names) -> Tuple[Dict[str, int], Union[Tuple[str, int], None]]:
+        """Like update_fridge, buy what the recipes need beyond the current
+        contents at the cheapest market, and record the purchase. Return
+        the shopping list and the result of find_cheapest.
+        """
+        total_recipe = add_recipes(read_recipe(recipe_file_name) for recipe_file_name in recipe_file_names)
+        shopping_list = {
+            ingredient: amount - self.amount(ingredient)
+            for ingredient, amount in total_recipe.items()
+            if amount - self.amount(ingredient) > 0
+        }
+        cheapest = find_cheapest(shopping_list, market_file_names)
+        assert cheapest is not None, "No market found"
+        self.buy(shopping_list)
+        return shopping_list, cheapest
+
+    def compact(self) -> None:
+        """Write the current contents as the new snapshot and restart the log."""
+        _replace(self.fridge_file_name, lambda file_name: write_recipe(self._contents, file_name))
+        self._log.close()
+        self._restart_log(_digest(self.fridge_file_name))
+        self._log = open(self.log_file_name, "ab")
+
+    def close(self) -> None:
+        """Compact the store if its log is not empty, and close the log."""
+        if self._log.closed:
+            return
+        if self.n_logged:
+            self.compact()
+        self._log.close()
@@ -0,0 +1,154 @@
+import argparse
+import glob
+import json
+import os
+import platform
+import random
+import time
+import tracemalloc
+
+from dense_life import DenseBoard
+from life import Board, Point, load_from_file
+from packed_life import PackedBoard
+
+BOARDS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "boards")
+
+# Each engine is a pair (build a copy of a Board, compute one generation).
+ENGINES = {
+    "set": (lambda board: Board(board.x_size, board.y_size, board.alive_points), Board.next_step),
+    "incremental": (
+        lambda board: Board(board.x_size, board.y_size, board.alive_points),
+        Board.next_step_incremental,
+    ),
+    "packed": (PackedBoard.from_board, PackedBoard.next_step),
+    "dense": (DenseBoard.from_board, DenseBoard.next_step),
+}
+
+
+def board_files():
+    """Return the non-empty board files of the boards/ directory."""
+    return sorted(filename for filename in glob.glob(os.path.join(BOARDS_DIR, "*.lf")) if os.path.getsize(filename))
+
+
+def random_board(x_size, y_size, density, seed=0):
+    """Return a Board where each cell is alive with probability density."""
+    rng = random.Random(seed)
+    points = [Point(x, y) for x in range(x_size) for y in range(y_size) if rng.random() < density]
+    return Board(x_size, y_size, points)
+
+
+def measure_memory(engine, board):
+    """Return the number of bytes held by the live points engine computes
+    in one step of board (the points of the initial board are shared).
+    """
+    build, step = ENGINES[engine]
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        copy = build(board)
+        step(copy)
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del copy
+    return after - before
+
+
+def measure_throughput(engine, board, n_steps):
+    """Return the number of generations per second engine computes on board."""
+    build, step = ENGINES[engine]
+    copy = build(board)
+    start = time.perf_counter()
+    for _ in range(n_steps):
+        step(copy)
+    return n_steps / (time.perf_counter() - start)
+
+
+def measure_allocations(engine, board, n_steps):
+    """Return (peak, per_step): the peak number of traced bytes while
+    engine runs n_steps generations of board, and the mean number of bytes
+    allocated on top of the live state during a single step.
+    """
+    build, step = ENGINES[engine]
+    tracemalloc.start()
+    try:
+        copy = build(board)
+        peak = 0
+        per_step = 0
+        for _ in range(n_steps):
+            current = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            step(copy)
+            step_peak = tracemalloc.get_traced_memory()[1]
+            peak = max(peak, step_peak)
+            per_step += step_peak - current
+    finally:
+        tracemalloc.stop()
+    return peak, per_step / n_steps if n_steps else 0
+
+
+def run(engine, name, board, n_steps):
+    """Benchmark engine on board and return the results as a dict."""
+    generations_per_second = measure_throughput(engine, board, n_steps)
+    peak_bytes, step_bytes = measure_allocations(engine, board, min(n_steps, 10))
+    return {
+        "board": name,
+        "engine": engine,
+        "x_size": board.x_size,
+        "y_size": board.y_size,
+        "points": len(board.alive_points),
+        "generations": n_steps,
+        "generations_per_second": generations_per_second,
+        "cells_per_second": generations_per_second * board.x_size * board.y_size,
+        "state_bytes": measure_memory(engine, board),
+        "peak_bytes": peak_bytes,
+        "allocated_bytes_per_step": step_bytes,
+    }
+
+
+def main(argv=None):
+    """Benchmark the engines on the board files and on random boards,
+    print a table and optionally write the results as JSON.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the Game of Life engines.")
+    parser.add_argument("--engines", nargs="+", default=list(ENGINES), choices=list(ENGINES))
+    parser.add_argument("--generations", type=int, default=200)
+    parser.add_argument("--sizes", nargs="*", type=int, default=[], help="side lengths of random boards")
+    parser.add_argument("--density", type=float, default=0.3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-files", action="store_true", help="skip the boards/ patterns")
+    parser.add_argument("--json", help="file to write the results to")
+    args = parser.parse_args(argv)
+
+    boards = [] if args.no_files else [(os.path.basename(f), load_from_file(f)) for f in board_files()]
+    for size in args.sizes:
+        boards.append((f"random-{size}", random_board(size, size, args.density, args.seed)))
+
+    results = []
+    print(f"{'board':<16}{'engine':<12}{'points':>8}{'gen/s':>12}{'cells/s':>14}{'peak B':>12}{'B/step':>12}")
+    for name, board in boards:
+        for engine in args.engines:
+            result = run(engine, name, board, args.generations)
+            results.append(result)
+            print(
+                f"{name:<16}{engine:<12}{result['points']:>8}{result['generations_per_second']:>12.0f}"
+                f"{result['cells_per_second']:>14.3g}{result['peak_bytes']:>12}"
+                f"{result['allocated_bytes_per_step']:>12.0f}"
+            )
+
+    if args.json:
+        report = {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "generations": args.generations,
+            "density": args.density,
+            "seed": args.seed,
+            "results": results,
+        }
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
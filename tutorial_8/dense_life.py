@@ -0,0 +1,159 @@
+from collections.abc import Set
+
+import numpy as np
+
+from life import Board, Point
+
+# The array holds the board, the one-cell ring around it in which
+# Board.next_step can still give birth to points, and one more row/column
+# of permanently dead cells so that the ring's neighbors can be read by slicing.
+MARGIN = 2
+
+
+def neighbor_counts(cells, r0, r1):
+    """Return the number of live neighbors of the cells in array rows
+    r0..r1-1 (all columns but the outermost two) by summing shifted
+    slices of cells. Rows r0-1 and r1 are read as the halo.
+    """
+    window = cells[r0 - 1 : r1 + 1]
+    vertical = window[:-2] + window[1:-1]
+    vertical += window[2:]
+    counts = vertical[:, :-2] + vertical[:, 1:-1]
+    counts += vertical[:, 2:]
+    counts -= window[1:-1, 1:-1]
+    return counts
+
+
+def _frame_rectangles(x_size, y_size):
+    """Return the (rows, columns) array ranges of the cells lying within one
+    cell of the ring, i.e. the only cells whose fate depends on is_legal.
+    """
+    first, last = 1, x_size + MARGIN + 1
+    left, right = 1, y_size + MARGIN + 1
+    return [
+        ((first, first + 2), (left, right)),
+        ((last - 2, last), (left, right)),
+        ((first, last), (left, left + 2)),
+        ((first, last), (right - 2, right)),
+    ]
+
+
+def step_rows(cells, next_cells, x_size, y_size, r0, r1):
+    """Write the next generation of array rows r0..r1-1 of cells into
+    next_cells, with the same edge behavior as Board.next_step: only legal
+    live points and the neighbors of legal live points are candidates.
+    """
+    # A cell lives on iff (neighbors | alive) == 3: a dead cell needs three
+    # neighbors, a live one two or three.
+    counts = neighbor_counts(cells, r0, r1)
+    counts |= cells[r0:r1, 1:-1]
+    np.equal(counts, 3, out=next_cells[r0:r1, 1:-1], casting="unsafe")
+
+    # Cells next to the ring may only owe their neighbors to illegal points,
+    # in which case Board.next_step never looks at them.
+    for (f0, f1), (c0, c1) in _frame_rectangles(x_size, y_size):
+        f0, f1 = max(f0, r0), min(f1, r1)
+        if f0 >= f1:
+            continue
+        legal = cells[f0 - 1 : f1 + 1, c0 - 1 : c1 + 1].copy()
+        legal[: max(0, MARGIN - (f0 - 1))] = 0
+        legal[max(0, x_size + MARGIN - (f0 - 1)) :] = 0
+        legal[:, : max(0, MARGIN - (c0 - 1))] = 0
+        legal[:, max(0, y_size + MARGIN - (c0 - 1)) :] = 0
+        candidate = legal[1:-1, 1:-1] | (neighbor_counts(legal, 1, f1 - f0 + 1) > 0)
+        next_cells[f0:f1, c0:c1] &= candidate
+
+
+class AlivePoints(Set):
+    """Read-only set view of the live Points of a DenseBoard."""
+
+    def __init__(self, board):
+        self._board = board
+
+    def __contains__(self, point):
+        return isinstance(point, Point) and self._board.is_point_alive(point)
+
+    def __len__(self):
+        return int(np.count_nonzero(self._board.cells))
+
+    def __iter__(self):
+        xs, ys = np.nonzero(self._board.cells)
+        for x, y in zip(xs.tolist(), ys.tolist()):
+            yield Point(x - MARGIN, y - MARGIN)
+
+    def __repr__(self):
+        return "{" + ", ".join(repr(point) for point in self) + "}"
+
+
+class DenseBoard:
+    """A board to play the Game of Life on, stored as a numpy array.
+    It has the same rules, including the edge behavior, as Board.
+    Data attributes:
+    cells   -- uint8 array of shape (x_size + 4, y_size + 4); cells[x + 2, y + 2]
+               is 1 iff Point(x, y) is alive
+    x_size  -- size in x-direction
+    y_size  -- size in y-direction
+    """
+
+    def __init__(self, x_size, y_size, points=()):
+        self.x_size = x_size
+        self.y_size = y_size
+        self.cells = np.zeros((x_size + 2 * MARGIN, y_size + 2 * MARGIN), dtype=np.uint8)
+        self._next_cells = np.zeros_like(self.cells)
+        for point in points:
+            self.cells[self._index(point.x, point.y)] = 1
+
+    @classmethod
+    def from_board(cls, board):
+        """Return a DenseBoard holding the same configuration as board."""
+        return cls(board.x_size, board.y_size, board.alive_points)
+
+    def to_board(self):
+        """Return a Board holding the same configuration."""
+        return Board(self.x_size, self.y_size, self.alive_points)
+
+    @property
+    def alive_points(self):
+        return AlivePoints(self)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, DenseBoard):
+            return NotImplemented
+        return (
+            self.x_size == other.x_size and self.y_size == other.y_size and np.array_equal(self.cells, other.cells)
+        )
+
+    def __repr__(self) -> str:
+        return f"DenseBoard(x_size={self.x_size}, y_size={self.y_size}, alive_points={self.alive_points})"
+
+    def __copy__(self):
+        board = DenseBoard(self.x_size, self.y_size)
+        board.cells[...] = self.cells
+        return board
+
+    def _index(self, x, y):
+        """Return the array index of Point(x, y)."""
+        if not (-1 <= x <= self.x_size and -1 <= y <= self.y_size):
+            raise ValueError(f"Point({x}, {y}) is more than one cell away from the board")
+        return x + MARGIN, y + MARGIN
+
+    def is_legal(self, point):
+        """Check if a given Point is on the board."""
+        return 0 <= point.x < self.x_size and 0 <= point.y < self.y_size
+
+    def is_point_alive(self, point):
+        """Check if a given Point is alive."""
+        if not (-1 <= point.x <= self.x_size and -1 <= point.y <= self.y_size):
+            return False
+        return bool(self.cells[point.x + MARGIN, point.y + MARGIN])
+
+    def next_step(self):
+        """Compute the points alive in the next round and update the
+        points of the Board.
+        """
+        step_rows(self.cells, self._next_cells, self.x_size, self.y_size, 1, self.x_size + MARGIN + 1)
+        self.cells, self._next_cells = self._next_cells, self.cells
+
+    def toggle_point(self, x, y):
+        """Add Point(x,y) if it is not alive, otherwise delete it."""
+        self.cells[self._index(x, y)] ^= 1
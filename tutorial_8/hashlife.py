@@ -0,0 +1,270 @@
+from typing import Dict, Iterator, Tuple
+
+from life import Board, Point, load_from_file, save_to_file
+
+
+class Node:
+    """A square quadtree node of side 2**level. Nodes are canonical: two
+    nodes holding the same pattern are the same object, so they are
+    compared and hashed by identity.
+    Data attributes:
+    level      -- log2 of the side length
+    nw, ne, sw, se -- the four quadrants (None for a level-0 cell)
+    population -- number of live cells
+    results    -- memoized successors, keyed by the log2 of the number of generations
+    """
+
+    __slots__ = ("level", "nw", "ne", "sw", "se", "population", "results")
+
+    def __init__(self, level, nw, ne, sw, se, population):
+        self.level = level
+        self.nw = nw
+        self.ne = ne
+        self.sw = sw
+        self.se = se
+        self.population = population
+        self.results = {}
+
+    def __repr__(self):
+        return f"Node(level={self.level}, population={self.population})"
+
+
+DEAD = Node(0, None, None, None, None, 0)
+ALIVE = Node(0, None, None, None, None, 1)
+
+
+class HashLife:
+    """A Game of Life universe using Gosper's Hashlife algorithm.
+    The universe is unbounded: unlike Board.next_step, points are not
+    killed when they leave the board, so both agree only as long as the
+    pattern stays clear of the board's edges.
+    Data attributes:
+    root        -- the Node holding the pattern
+    x, y        -- coordinates of the top left cell of root ('nw' is towards smaller x and y)
+    generation  -- number of generations computed so far
+    max_nodes   -- the node cache is garbage collected once it holds more nodes
+    """
+
+    def __init__(self, points=(), max_nodes=1_000_000):
+        self.max_nodes = max_nodes
+        self._nodes: Dict[Tuple[Node, Node, Node, Node], Node] = {}
+        self._empty = [DEAD]
+        self.generation = 0
+        self.root, self.x, self.y = self._build(points)
+
+    @classmethod
+    def from_board(cls, board, max_nodes=1_000_000):
+        """Return a HashLife universe holding the live points of board."""
+        return cls(board.alive_points, max_nodes)
+
+    @classmethod
+    def from_file(cls, filename, max_nodes=1_000_000):
+        """Return a HashLife universe holding the board stored in filename."""
+        return cls.from_board(load_from_file(filename), max_nodes)
+
+    def to_board(self, x_size, y_size):
+        """Return a Board of the given size holding the live points."""
+        return Board(x_size, y_size, self.alive_points())
+
+    def save_to_file(self, filename, x_size, y_size):
+        """Write the live points to filename in the format read by load_from_file."""
+        save_to_file(self.to_board(x_size, y_size), filename)
+
+    @property
+    def population(self):
+        return self.root.population
+
+    @property
+    def node_count(self):
+        return len(self._nodes)
+
+    def join(self, nw, ne, sw, se):
+        """Return the canonical node with the four given quadrants."""
+        key = (nw, ne, sw, se)
+        node = self._nodes.get(key)
+        if node is None:
+            population = nw.population + ne.population + sw.population + se.population
+            node = Node(nw.level + 1, nw, ne, sw, se, population)
+            self._nodes[key] = node
+        return node
+
+    def empty(self, level):
+        """Return the canonical dead node of the given level."""
+        while len(self._empty) <= level:
+            e = self._empty[-1]
+            self._empty.append(self.join(e, e, e, e))
+        return self._empty[level]
+
+    def _build(self, points):
+        """Return (root, x, y) for the quadtree holding points."""
+        coordinates = {(point.x, point.y) for point in points}
+        if not coordinates:
+            return self.empty(2), 0, 0
+        x0 = min(x for x, _ in coordinates)
+        y0 = min(y for _, y in coordinates)
+        cells = {(x - x0, y - y0): ALIVE for x, y in coordinates}
+        level = 0
+        while level < 2 or len(cells) > 1 or (0, 0) not in cells:
+            e = self.empty(level)
+            parents = {}
+            for x, y in cells:
+                parents[(x >> 1, y >> 1)] = None
+            cells = {
+                (x, y): self.join(
+                    cells.get((2 * x, 2 * y), e),
+                    cells.get((2 * x, 2 * y + 1), e),
+                    cells.get((2 * x + 1, 2 * y), e),
+                    cells.get((2 * x + 1, 2 * y + 1), e),
+                )
+                for x, y in parents
+            }
+            level += 1
+        return cells[(0, 0)], x0, y0
+
+    def alive_points(self) -> Iterator[Point]:
+        """Generate the live points of the universe."""
+        stack = [(self.root, self.x, self.y)]
+        while stack:
+            node, x, y = stack.pop()
+            if node.population == 0:
+                continue
+            if node.level == 0:
+                yield Point(x, y)
+                continue
+            half = 1 << (node.level - 1)
+            stack.append((node.nw, x, y))
+            stack.append((node.ne, x, y + half))
+            stack.append((node.sw, x + half, y))
+            stack.append((node.se, x + half, y + half))
+
+    def is_point_alive(self, point):
+        """Check if a given Point is alive."""
+        node, x, y = self.root, point.x - self.x, point.y - self.y
+        size = 1 << node.level
+        if not (0 <= x < size and 0 <= y < size):
+            return False
+        while node.level > 0 and node.population:
+            half = 1 << (node.level - 1)
+            if x < half:
+                node = node.nw if y < half else node.ne
+            else:
+                node = node.sw if y < half else node.se
+            x, y = x % half, y % half
+        return node is ALIVE
+
+    def _centre(self, node):
+        """Return the node one level up with node in its centre."""
+        e = self.empty(node.level - 1)
+        return self.join(
+            self.join(e, e, e, node.nw),
+            self.join(e, e, node.ne, e),
+            self.join(e, node.sw, e, e),
+            self.join(node.se, e, e, e),
+        )
+
+    def _is_padded(self, node):
+        """Check that all live cells of node lie in its central quarter."""
+        return (
+            node.nw.se.se.population == node.nw.population
+            and node.ne.sw.sw.population == node.ne.population
+            and node.sw.ne.ne.population == node.sw.population
+            and node.se.nw.nw.population == node.se.population
+        )
+
+    def _life_4x4(self, node):
+        """Return the central 2x2 node of a 4x4 node one generation later."""
+        rows = [
+            [node.nw.nw, node.nw.ne, node.ne.nw, node.ne.ne],
+            [node.nw.sw, node.nw.se, node.ne.sw, node.ne.se],
+            [node.sw.nw, node.sw.ne, node.se.nw, node.se.ne],
+            [node.sw.sw, node.sw.se, node.se.sw, node.se.se],
+        ]
+        cells = [[cell.population for cell in row] for row in rows]
+        result = []
+        for i in (1, 2):
+            for j in (1, 2):
+                neighbors = sum(cells[i + di][j + dj] for di in (-1, 0, 1) for dj in (-1, 0, 1)) - cells[i][j]
+                alive = neighbors == 3 or (neighbors == 2 and cells[i][j] == 1)
+                result.append(ALIVE if alive else DEAD)
+        return self.join(*result)
+
+    def successor(self, node, j):
+        """Return the central node, one level down, of node advanced
+        2**min(j, node.level - 2) generations.
+        """
+        j = min(j, node.level - 2)
+        result = node.results.get(j)
+        if result is not None:
+            return result
+        if node.population == 0:
+            result = self.empty(node.level - 1)
+        elif node.level == 2:
+            result = self._life_4x4(node)
+        else:
+            nw, ne, sw, se = node.nw, node.ne, node.sw, node.se
+            c1 = self.successor(nw, j)
+            c2 = self.successor(self.join(nw.ne, ne.nw, nw.se, ne.sw), j)
+            c3 = self.successor(ne, j)
+            c4 = self.successor(self.join(nw.sw, nw.se, sw.nw, sw.ne), j)
+            c5 = self.successor(self.join(nw.se, ne.sw, sw.ne, se.nw), j)
+            c6 = self.successor(self.join(ne.sw, ne.se, se.nw, se.ne), j)
+            c7 = self.successor(sw, j)
+            c8 = self.successor(self.join(sw.ne, se.nw, sw.se, se.sw), j)
+            c9 = self.successor(se, j)
+            if j < node.level - 2:
+                result = self.join(
+                    self.join(c1.se, c2.sw, c4.ne, c5.nw),
+                    self.join(c2.se, c3.sw, c5.ne, c6.nw),
+                    self.join(c4.se, c5.sw, c7.ne, c8.nw),
+                    self.join(c5.se, c6.sw, c8.ne, c9.nw),
+                )
+            else:
+                result = self.join(
+                    self.successor(self.join(c1, c2, c4, c5), j),
+                    self.successor(self.join(c2, c3, c5, c6), j),
+                    self.successor(self.join(c4, c5, c7, c8), j),
+                    self.successor(self.join(c5, c6, c8, c9), j),
+                )
+        node.results[j] = result
+        return result
+
+    def step(self, j):
+        """Advance the universe by 2**j generations in a single jump."""
+        root, x, y = self.root, self.x, self.y
+        while root.level < j + 3 or not self._is_padded(root):
+            half = 1 << (root.level - 1)
+            root, x, y = self._centre(root), x - half, y - half
+        quarter = 1 << (root.level - 2)
+        self.root = self.successor(root, j)
+        self.x, self.y = x + quarter, y + quarter
+        self.generation += 1 << j
+        if len(self._nodes) > self.max_nodes:
+            self.collect()
+
+    def advance(self, n):
+        """Advance the universe by n generations, jumping 2**j generations
+        at a time for every bit j set in n.
+        """
+        j = 0
+        while n:
+            if n & 1:
+                self.step(j)
+            n >>= 1
+            j += 1
+
+    def collect(self):
+        """Garbage collect the node cache: keep only the nodes reachable
+        from root and forget all memoized successors.
+        """
+        nodes = {}
+        stack = [self.root] + self._empty[1:]
+        while stack:
+            node = stack.pop()
+            node.results = {}
+            if node.level == 0:
+                continue
+            key = (node.nw, node.ne, node.sw, node.se)
+            if key not in nodes:
+                nodes[key] = node
+                stack.extend(key)
+        self._nodes = nodes
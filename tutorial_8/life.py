@@ -1,5 +1,9 @@
 from copy import copy
-from typing import Tuple, Union
+from itertools import islice
+from typing import Iterator, List, Optional, Tuple, Union
+
+MASK_64 = (1 << 64) - 1
+CHUNK_SIZE = 1 << 16
 
 
 class Point:
@@ -29,6 +33,15 @@ class Point:
     def __hash__(self):
         return hash((self.x, self.y))
 
+    def zobrist_key(self):
+        """Return a pseudo-random 64-bit key for the Point, obtained by
+        mixing its coordinates with splitmix64.
+        """
+        z = (((self.x & 0xFFFFFFFF) << 32 | (self.y & 0xFFFFFFFF)) + 0x9E3779B97F4A7C15) & MASK_64
+        z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASK_64
+        z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASK_64
+        return z ^ (z >> 31)
+
     def neighbor_generator(self):
         """Generates the eight neighbors of a point."""
         for dx in range(-1, 2):
@@ -42,12 +55,25 @@ class Point:
         return set(self.neighbor_generator())
 
 
+def zobrist_hash(points) -> int:
+    """Return the XOR of the Zobrist keys of the given Points."""
+    result = 0
+    for point in points:
+        result ^= point.zobrist_key()
+    return result
+
+
 class Board:
     """A board to play the Game of Life on.
     Data attributes:
     alive_points -- a set of Points
     x_size  -- size in x-direction
     y_size  -- size in y-direction
+    changed_points -- the Points changed by the last incremental step or
+                      toggled since, or None if unknown (the next
+                      incremental step then evaluates the whole board)
+    zobrist -- Zobrist hash of alive_points, updated on every toggle, birth
+               and death
     """
 
     N_MAX_STEPS = 1000
@@ -56,6 +82,8 @@ class Board:
         self.x_size = x_size
         self.y_size = y_size
         self.alive_points = set(points)
+        self.changed_points = None
+        self.zobrist = zobrist_hash(self.alive_points)
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Board):
@@ -87,6 +115,14 @@ class Board:
         """Compute the number of live neighbors of p on the Board."""
         return len([self.is_legal(point) for point in p.get_neighbors()])
 
+    def is_candidate(self, point):
+        """Check if next_step evaluates the given Point, i.e. if it is
+        a legal live Point or a neighbor of one.
+        """
+        if self.is_point_alive(point) and self.is_legal(point):
+            return True
+        return any(self.is_point_alive(p) and self.is_legal(p) for p in point.neighbor_generator())
+
     def is_point_present_at_next_step(self, point):
         """Check if a given Point is alive at the next step."""
         if self.is_point_alive(point):
@@ -110,7 +146,42 @@ class Board:
             if self.is_point_present_at_next_step(point):
                 next_points.add(point)
 
+        self.zobrist ^= zobrist_hash(self.alive_points ^ next_points)
         self.alive_points = next_points
+        self.changed_points = None
+
+    def next_step_incremental(self):
+        """Compute the next round like next_step, but only re-evaluate
+        the Points changed in the previous round and their neighbors:
+        the fate of a Point only depends on its neighborhood, so every
+        other Point keeps its state. Return the number of changed Points.
+        """
+        if self.changed_points is None:
+            previous_points = self.alive_points
+            self.next_step()
+            self.changed_points = previous_points ^ self.alive_points
+            return len(self.changed_points)
+
+        to_check = set(self.changed_points)
+        for point in self.changed_points:
+            to_check.update(point.neighbor_generator())
+
+        changed_points = set()
+        for point in to_check:
+            present = self.is_candidate(point) and self.is_point_present_at_next_step(point)
+            if present != self.is_point_alive(point):
+                changed_points.add(point)
+
+        self.alive_points ^= changed_points
+        self.changed_points = changed_points
+        self.zobrist ^= zobrist_hash(changed_points)
+        return len(changed_points)
+
+    def run_incremental(self, n_steps) -> List[int]:
+        """Run n_steps incremental rounds and return the number of
+        changed Points in each of them.
+        """
+        return [self.next_step_incremental() for _ in range(n_steps)]
 
     def toggle_point(self, x, y):
         """Add Point(x,y) if it is not in alive_points, otherwise delete it
@@ -121,8 +192,11 @@ class Board:
             self.alive_points.remove(point)
         else:
             self.alive_points.add(point)
+        self.zobrist ^= point.zobrist_key()
+        if self.changed_points is not None:
+            self.changed_points.add(point)
 
-    def is_periodic(self) -> Union[None, Tuple[bool, int]]:
+    def is_periodic(self, quiet=False) -> Union[None, Tuple[bool, int]]:
         """
         Return (True, 0) if the input board is periodic, otherwise (False, i),
         where i is the smallest index of the state to which it loops
@@ -131,15 +205,60 @@ class Board:
         states_by_idx[self] = 0
 
         next = copy(self)
-        print("CURRENT STATE: idx = 0", next)
+        if not quiet:
+            print("CURRENT STATE: idx = 0", next)
         for step in range(1, Board.N_MAX_STEPS):
             next.next_step()
-            print("NEXT STATE: idx = ", step, next)
+            if not quiet:
+                print("NEXT STATE: idx = ", step, next)
             if next in states_by_idx:
-                print("END OF THE PROCESS #########", states_by_idx[next])
+                if not quiet:
+                    print("END OF THE PROCESS #########", states_by_idx[next])
                 return (True, 0) if next == self else (False, step)
             states_by_idx[next] = step
 
+    def find_cycle(self, max_steps=N_MAX_STEPS, quiet=True) -> Optional[Tuple[int, int]]:
+        """Return (start, period) such that the board first reaches a state
+        seen before at step start + period, that state being the one of step
+        start. Every cycle with start + period <= max_steps is found; return
+        None if there is none, after fewer than 4 * max_steps steps (longer
+        cycles may be found too). Uses Brent's algorithm on the Zobrist
+        hashes, so only two boards are kept in memory; states are identified
+        by their 64-bit hash alone.
+        """
+        power = period = 1
+        tortoise = self.zobrist
+        hare = copy(self)
+        hare.next_step_incremental()
+        steps = 1
+        while hare.zobrist != tortoise:
+            if power == period:
+                # The tortoise sat at step power - 1 for power steps: any cycle
+                # with start < power and period <= power was found.
+                if power > max_steps:
+                    return None
+                tortoise = hare.zobrist
+                power *= 2
+                period = 0
+            hare.next_step_incremental()
+            steps += 1
+            period += 1
+            if not quiet:
+                print("STEP", steps, "HASH", hex(hare.zobrist))
+
+        tortoise_board = copy(self)
+        hare = copy(self)
+        for _ in range(period):
+            hare.next_step_incremental()
+        start = 0
+        while tortoise_board.zobrist != hare.zobrist:
+            tortoise_board.next_step_incremental()
+            hare.next_step_incremental()
+            start += 1
+        if not quiet:
+            print("CYCLE START", start, "PERIOD", period)
+        return start, period
+
 
 def load_from_file(filename) -> "Board":
     """Load and return a board configuration from file in the following format:
@@ -159,6 +278,42 @@ def load_from_file(filename) -> "Board":
     return Board(x_size, y_size, points)
 
 
-def is_periodic(board: Board) -> Union[None, Tuple[bool, int]]:
+def save_to_file(board, filename) -> None:
+    """Write the board configuration to file in the format read by
+    load_from_file.
+    """
+    with open(filename, "w") as f:
+        f.write(f"{board.x_size}\n{board.y_size}\n")
+        f.writelines(f"{point.x},{point.y}\n" for point in board.alive_points)
+
+
+def stream_from_file(filename, chunk_size=CHUNK_SIZE) -> Tuple[int, int, Iterator[List[Point]]]:
+    """Open a board file in the load_from_file format and return
+    (x_size, y_size, chunks), where chunks generates the live points as
+    lists of at most chunk_size Points. The file is closed once chunks is
+    exhausted.
+    """
+    f = open(filename)
+    x_size = int(f.readline())
+    y_size = int(f.readline())
+    return x_size, y_size, _read_point_chunks(f, chunk_size)
+
+
+def _read_point_chunks(f, chunk_size) -> Iterator[List[Point]]:
+    """Generate the points of the remaining lines of f, chunk_size at a time."""
+    with f:
+        while True:
+            lines = list(islice(f, chunk_size))
+            if not lines:
+                return
+            yield [Point(*map(int, line.split(","))) for line in lines]
+
+
+def is_periodic(board: Board, quiet=False) -> Union[None, Tuple[bool, int]]:
     """Return True if the input board is periodic, otherwise False."""
-    return board.is_periodic()
+    return board.is_periodic(quiet)
+
+
+def find_cycle(board: Board, max_steps=Board.N_MAX_STEPS, quiet=True) -> Optional[Tuple[int, int]]:
+    """Return the (start, period) of the cycle the board falls into, or None."""
+    return board.find_cycle(max_steps, quiet)
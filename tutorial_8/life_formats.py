@@ -0,0 +1,162 @@
+import re
+import struct
+from typing import Iterator, Tuple
+
+import numpy as np
+
+from dense_life import MARGIN, DenseBoard
+from life import Board, Point
+
+PACKED_MAGIC = b"LIFEPK1\n"
+PACKED_HEADER = struct.Struct("<8sQQ")
+RLE_LINE_LENGTH = 70
+RLE_TOKEN = re.compile(r"(\d*)([^\d\s])")
+CHUNK_BYTES = 1 << 24
+
+
+def stream_coordinates(filename, chunk_bytes=CHUNK_BYTES) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """Generate the live points of a file in the load_from_file format as
+    (xs, ys) integer arrays, parsing about chunk_bytes of the file at a time.
+    """
+    with open(filename, "rb") as f:
+        f.readline()
+        f.readline()
+        rest = b""
+        while True:
+            block = f.read(chunk_bytes)
+            data = rest + block
+            if block:
+                cut = data.rfind(b"\n") + 1
+                data, rest = data[:cut], data[cut:]
+            if data.strip():
+                values = np.fromstring(data.replace(b",", b" ").decode(), dtype=np.int64, sep=" ")
+                yield values[0::2], values[1::2]
+            if not block:
+                return
+
+
+def load_dense_from_file(filename, chunk_bytes=CHUNK_BYTES) -> DenseBoard:
+    """Load a file in the load_from_file format into a DenseBoard,
+    chunk_bytes at a time, without creating any Point.
+    """
+    with open(filename) as f:
+        x_size = int(f.readline())
+        y_size = int(f.readline())
+    board = DenseBoard(x_size, y_size)
+    for xs, ys in stream_coordinates(filename, chunk_bytes):
+        if len(xs) and (xs.min() < -1 or xs.max() > x_size or ys.min() < -1 or ys.max() > y_size):
+            raise ValueError("Point more than one cell away from the board")
+        board.cells[xs + MARGIN, ys + MARGIN] = 1
+    return board
+
+
+def save_packed(board, filename) -> None:
+    """Write the board to file as a header followed by one bit per cell
+    of the board and of the ring around it, row after row.
+    """
+    dense = board if isinstance(board, DenseBoard) else DenseBoard.from_board(board)
+    with open(filename, "wb") as f:
+        f.write(PACKED_HEADER.pack(PACKED_MAGIC, dense.x_size, dense.y_size))
+        f.write(np.packbits(dense.cells[1:-1, 1:-1]).tobytes())
+
+
+def map_packed(filename) -> np.ndarray:
+    """Memory-map a file written by save_packed and return its packed bits
+    as a read-only flat uint8 array.
+    """
+    x_size, y_size = _read_packed_header(filename)
+    n_bytes = ((x_size + 2) * (y_size + 2) + 7) // 8
+    return np.memmap(filename, dtype=np.uint8, mode="r", offset=PACKED_HEADER.size, shape=(n_bytes,))
+
+
+def load_packed(filename) -> DenseBoard:
+    """Load a file written by save_packed into a DenseBoard."""
+    x_size, y_size = _read_packed_header(filename)
+    bits = map_packed(filename)
+    board = DenseBoard(x_size, y_size)
+    n_cells = (x_size + 2) * (y_size + 2)
+    board.cells[1:-1, 1:-1] = np.unpackbits(bits, count=n_cells).reshape(x_size + 2, y_size + 2)
+    return board
+
+
+def _read_packed_header(filename):
+    """Return (x_size, y_size) from the header of a save_packed file."""
+    with open(filename, "rb") as f:
+        magic, x_size, y_size = PACKED_HEADER.unpack(f.read(PACKED_HEADER.size))
+    if magic != PACKED_MAGIC:
+        raise ValueError(f"{filename} is not a packed Life board")
+    return x_size, y_size
+
+
+def load_rle(filename, board_class=Board):
+    """Load a board from a file in the RLE format: a header line
+    'x = <x_size>, y = <y_size>' (comment lines start with '#'), then runs
+    of 'b' (dead) and 'o' (alive) cells along x, '$' ending a row and '!'
+    ending the pattern.
+    """
+    with open(filename) as f:
+        lines = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+    header = dict(
+        (key.strip(), value.strip()) for key, value in (item.split("=") for item in lines[0].split(","))
+    )
+    x_size, y_size = int(header["x"]), int(header["y"])
+
+    points = []
+    x = y = 0
+    for count, tag in RLE_TOKEN.findall("".join(lines[1:])):
+        count = int(count) if count else 1
+        if tag == "!":
+            break
+        if tag == "$":
+            x, y = 0, y + count
+        elif tag == "b":
+            x += count
+        else:
+            points.extend(Point(x + i, y) for i in range(count))
+            x += count
+    return board_class(x_size, y_size, points)
+
+
+def save_rle(board, filename) -> None:
+    """Write the cells of the board to file in the RLE format. Live points
+    outside of the board are not written.
+    """
+    rows = {}
+    for point in board.alive_points:
+        if board.is_legal(point):
+            rows.setdefault(point.y, []).append(point.x)
+
+    tokens = []
+    y_previous = 0
+    for y in sorted(rows):
+        if y > y_previous:
+            tokens.append(_rle_run(y - y_previous, "$"))
+        y_previous = y
+        x_previous = 0
+        xs = sorted(rows[y])
+        start = 0
+        while start < len(xs):
+            end = start
+            while end + 1 < len(xs) and xs[end + 1] == xs[end] + 1:
+                end += 1
+            if xs[start] > x_previous:
+                tokens.append(_rle_run(xs[start] - x_previous, "b"))
+            tokens.append(_rle_run(end - start + 1, "o"))
+            x_previous = xs[end] + 1
+            start = end + 1
+    tokens.append("!")
+
+    with open(filename, "w") as f:
+        f.write(f"x = {board.x_size}, y = {board.y_size}, rule = B3/S23\n")
+        line = ""
+        for token in tokens:
+            if len(line) + len(token) > RLE_LINE_LENGTH:
+                f.write(line + "\n")
+                line = ""
+            line += token
+        f.write(line + "\n")
+
+
+def _rle_run(count, tag):
+    """Return the RLE token for count times tag."""
+    return f"{count}{tag}" if count > 1 else tag
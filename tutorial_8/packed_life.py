@@ -0,0 +1,93 @@
+from collections import Counter
+
+from life import Board, Point
+
+# A point (x, y) is packed into the single int x * STRIDE + y, which is
+# valid for coordinates in [-2**31, 2**31). Moving to a neighbor is then a
+# single addition.
+STRIDE = 1 << 32
+HALF = 1 << 31
+NEIGHBOR_OFFSETS = tuple(dx * STRIDE + dy for dx in range(-1, 2) for dy in range(-1, 2) if dx != 0 or dy != 0)
+
+
+def pack(x, y) -> int:
+    """Return the packed int encoding the point (x, y)."""
+    return x * STRIDE + y
+
+
+def unpack(key):
+    """Return the (x, y) coordinates encoded by the packed int key."""
+    x, y = divmod(key + HALF, STRIDE)
+    return x, y - HALF
+
+
+class PackedBoard:
+    """A board to play the Game of Life on, storing its live points as
+    packed ints instead of Point objects. It has the same rules, including
+    the edge behavior, as Board.
+    Data attributes:
+    keys    -- a set of packed ints, one per live point
+    x_size  -- size in x-direction
+    y_size  -- size in y-direction
+    """
+
+    def __init__(self, x_size, y_size, points=()):
+        self.x_size = x_size
+        self.y_size = y_size
+        self.keys = {pack(point.x, point.y) for point in points}
+
+    @classmethod
+    def from_board(cls, board):
+        """Return a PackedBoard holding the same configuration as board."""
+        return cls(board.x_size, board.y_size, board.alive_points)
+
+    def to_board(self):
+        """Return a Board holding the same configuration."""
+        return Board(self.x_size, self.y_size, self.alive_points)
+
+    @property
+    def alive_points(self):
+        return {Point(*unpack(key)) for key in self.keys}
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PackedBoard):
+            return NotImplemented
+        return self.x_size == other.x_size and self.y_size == other.y_size and self.keys == other.keys
+
+    def __repr__(self) -> str:
+        return f"PackedBoard(x_size={self.x_size}, y_size={self.y_size}, alive_points={self.alive_points})"
+
+    def __copy__(self):
+        board = PackedBoard(self.x_size, self.y_size)
+        board.keys = self.keys.copy()
+        return board
+
+    def is_legal_key(self, key):
+        """Check if the point encoded by key is on the board."""
+        x, y = unpack(key)
+        return 0 <= x < self.x_size and 0 <= y < self.y_size
+
+    def is_legal(self, point):
+        """Check if a given Point is on the board."""
+        return 0 <= point.x < self.x_size and 0 <= point.y < self.y_size
+
+    def is_point_alive(self, point):
+        """Check if a given Point is alive."""
+        return pack(point.x, point.y) in self.keys
+
+    def next_step(self):
+        """Compute the points alive in the next round and update the
+        points of the Board.
+        """
+        keys = self.keys
+        counts = Counter(key + offset for key in keys for offset in NEIGHBOR_OFFSETS)
+        legal_keys = [key for key in keys if self.is_legal_key(key)]
+        candidates = set(legal_keys)
+        candidates.update(key + offset for key in legal_keys for offset in NEIGHBOR_OFFSETS)
+        self.keys = {
+            key for key in candidates if counts.get(key) == 3 or (counts.get(key) == 2 and key in keys)
+        }
+
+    def toggle_point(self, x, y):
+        """Add Point(x,y) if it is not alive, otherwise delete it."""
+        self.keys ^= {pack(x, y)}
@@ -0,0 +1,113 @@
+import os
+import weakref
+from multiprocessing import Pool
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from dense_life import MARGIN, DenseBoard, step_rows
+
+# State of a worker process: the two cell arrays, attached once by _attach.
+_worker = {}
+
+
+def _attach(names, shape, x_size, y_size):
+    """Pool initializer: map the shared cell arrays into the worker."""
+    buffers = [SharedMemory(name=name) for name in names]
+    _worker["buffers"] = buffers
+    _worker["arrays"] = [np.ndarray(shape, dtype=np.uint8, buffer=buffer.buf) for buffer in buffers]
+    _worker["size"] = (x_size, y_size)
+
+
+def _step_tile(source, r0, r1):
+    """Compute the next generation of array rows r0..r1-1. The halo rows
+    r0-1 and r1 are read directly from the shared array of the other tiles.
+    """
+    arrays = _worker["arrays"]
+    x_size, y_size = _worker["size"]
+    step_rows(arrays[source], arrays[1 - source], x_size, y_size, r0, r1)
+
+
+def _release(pool, buffers):
+    """Stop the workers of pool and unlink the shared memory buffers. The
+    buffers stay mapped until their last array is gone.
+    """
+    pool.close()
+    pool.join()
+    for buffer in buffers:
+        buffer.unlink()
+
+
+class TiledBoard(DenseBoard):
+    """A DenseBoard split into horizontal tiles, each stepped by a worker
+    of a process pool. Both generations live in shared memory, so a step
+    only sends (source, first row, last row) to each worker, and the result
+    is exactly the one of DenseBoard.next_step (hence of Board.next_step).
+    Use it as a context manager, or call close(), to release the workers
+    and the shared memory; they are also released when the board is
+    garbage collected or at interpreter exit.
+    Data attributes:
+    n_workers -- number of worker processes
+    tiles     -- list of (first row, last row + 1) array row ranges
+    """
+
+    def __init__(self, x_size, y_size, points=(), n_workers=None, n_tiles=None):
+        super().__init__(x_size, y_size, points)
+        self.n_workers = n_workers or os.cpu_count() or 1
+        n_tiles = min(n_tiles or self.n_workers, x_size + MARGIN)
+        rows = np.linspace(1, x_size + MARGIN + 1, n_tiles + 1).astype(int)
+        self.tiles = [(int(r0), int(r1)) for r0, r1 in zip(rows[:-1], rows[1:]) if r0 < r1]
+
+        self._buffers = [SharedMemory(create=True, size=self.cells.nbytes) for _ in range(2)]
+        arrays = [np.ndarray(self.cells.shape, dtype=np.uint8, buffer=buffer.buf) for buffer in self._buffers]
+        arrays[0][...] = self.cells
+        arrays[1][...] = 0
+        self.cells, self._next_cells = arrays
+        self._source = 0
+        self._pool = Pool(
+            self.n_workers,
+            initializer=_attach,
+            initargs=([buffer.name for buffer in self._buffers], self.cells.shape, x_size, y_size),
+        )
+        self._finalizer = weakref.finalize(self, _release, self._pool, self._buffers)
+
+    @classmethod
+    def from_board(cls, board, n_workers=None, n_tiles=None):
+        """Return a TiledBoard holding the same configuration as board."""
+        return cls(board.x_size, board.y_size, board.alive_points, n_workers, n_tiles)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __copy__(self):
+        board = DenseBoard(self.x_size, self.y_size)
+        board.cells[...] = self.cells
+        return board
+
+    def close(self):
+        """Stop the workers and free the shared memory. The board keeps a
+        private copy of its current generation.
+        """
+        if self._pool is None:
+            return
+        self._finalizer()
+        self._pool = None
+        self.cells = self.cells.copy()
+        self._next_cells = np.zeros_like(self.cells)
+        for buffer in self._buffers:
+            buffer.close()
+        self._buffers = []
+
+    def next_step(self):
+        """Compute the points alive in the next round and update the
+        points of the Board, one tile per worker.
+        """
+        if self._pool is None:
+            super().next_step()
+            return
+        self._pool.starmap(_step_tile, [(self._source, r0, r1) for r0, r1 in self.tiles])
+        self._source = 1 - self._source
+        self.cells, self._next_cells = self._next_cells, self.cells